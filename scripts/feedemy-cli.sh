@@ -371,6 +371,7 @@ cmd_test_print() {
 
     cd "$INSTALL_DIR"
     $PYTHON << 'PYSCRIPT'
+import asyncio
 import sys
 sys.path.insert(0, '.')
 
@@ -399,7 +400,7 @@ else:
     print(f"❌ Test başarısız: {result.error}")
     sys.exit(1)
 
-manager.stop()
+asyncio.run(manager.stop())
 PYSCRIPT
 }
 
@@ -5,16 +5,121 @@ Backend ile iletişim için HTTP client
 
 import asyncio
 import aiohttp
+from yarl import URL
+import json
 import logging
-from typing import Optional, List
+import random
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, List, Callable, Awaitable, Dict, Tuple, Mapping
 from dataclasses import dataclass
 
+__all__ = [
+    "FeedemyApiClient",
+    "ApiError",
+    "ApiConnectionError",
+    "RegisterResponse",
+    "CreatedPrinter",
+    "PendingJob",
+    "JobDetail",
+    "FailResponse",
+    "close_shared_connector",
+]
+
 logger = logging.getLogger(__name__)
 
+# orjson opsiyonel - yoksa stdlib json kullanılır
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson opsiyonel - büyük job payload'larını buffer'lamadan parse eder
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Configuration
 DEFAULT_TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds (exponential backoff)
+_BACKOFFS = tuple(RETRY_DELAY * (1 << i) for i in range(MAX_RETRIES))  # 1, 2, 4...
+LONG_POLL_WAIT = 25  # seconds - server holds the request until a job is ready
+LONG_POLL_GRACE = 5  # seconds - extra client timeout on top of the wait
+EVENTS_READ_TIMEOUT = 90  # seconds - no data/heartbeat this long = dead stream
+EVENTS_MAX_BACKOFF = 60  # seconds - reconnect delay cap
+BULK_BATCH_SIZE = 10  # max job status updates per bulk request
+KEEPALIVE_TIMEOUT = 300  # seconds - idle pooled connection lifetime (aiohttp default 15)
+# Endpoint'ler (session base_url'e göre relative)
+DEVICE_API = "/api/printer-device"
+JOBS_API = f"{DEVICE_API}/jobs"
+
+JOB_CACHE_SIZE = 128  # claim edilmiş JobDetail'ler (get_job_detail retry'ları için)
+
+# Tüm client instance'ları (token rotasyonu, re-register) aynı havuzu paylaşır
+_SHARED_CONNECTOR: Optional[aiohttp.TCPConnector] = None
+
+
+def _json_dumps(obj) -> bytes:
+    """Request body encode (orjson varsa onunla)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw):
+    """Response body decode - bytes/str kabul eder"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _get_shared_connector() -> aiohttp.TCPConnector:
+    """Process geneli connector - DNS cache ve TLS bağlantıları client'lar arası ortak"""
+    global _SHARED_CONNECTOR
+    if _SHARED_CONNECTOR is None or _SHARED_CONNECTOR.closed:
+        _SHARED_CONNECTOR = aiohttp.TCPConnector(
+            limit=20,  # max connections (tüm client'lar toplamı)
+            limit_per_host=5,
+            ttl_dns_cache=300,  # DNS cache 5 minutes
+            keepalive_timeout=KEEPALIVE_TIMEOUT,  # job'lar arası boşta TLS yeniden kurulmasın
+            enable_cleanup_closed=True
+        )
+    return _SHARED_CONNECTOR
+
+
+async def close_shared_connector() -> None:
+    """Paylaşılan connector'ı kapat (uygulama kapanırken, tüm client'lardan sonra)"""
+    global _SHARED_CONNECTOR
+    if _SHARED_CONNECTOR is not None and not _SHARED_CONNECTOR.closed:
+        await _SHARED_CONNECTOR.close()
+    _SHARED_CONNECTOR = None
+
+
+async def _read_json(response: aiohttp.ClientResponse, stream: bool = False):
+    """Response body'yi parse et.
+
+    stream=True ve ijson varsa body parça parça parse edilir; tüm body'nin
+    bytes kopyası + dict aynı anda bellekte tutulmaz (template_content büyük olabilir).
+    """
+    if stream and IJSON_AVAILABLE:
+        data = None
+        # "" prefix = top-level obje; EOF'a kadar okunur (bağlantı havuza döner)
+        async for data in ijson.items_async(response.content, "", use_float=True):
+            pass
+        return data
+    return _json_loads(await response.read())
+
+
+# Read-only - her istekte paylaşılır, kopyalanmaz
+BASE_HEADERS: Mapping[str, str] = MappingProxyType({
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "FeedemyPrinter/1.0"
+})
 
 
 @dataclass
@@ -34,8 +139,11 @@ class CreatedPrinter:
     device_address: Optional[str]
 
 
+# Hot path kayıtları __slots__'lu: instance __dict__ yok, daha hızlı oluşturulur
+# (dataclass(slots=True) Python 3.10+ - Pi'lerde 3.9 destekleniyor)
 @dataclass
 class PendingJob:
+    __slots__ = ("job_guid", "order_guid", "priority", "created_at")
     job_guid: str
     order_guid: str
     priority: int
@@ -44,6 +152,10 @@ class PendingJob:
 
 @dataclass
 class JobDetail:
+    __slots__ = (
+        "job_guid", "order_guid", "print_template_guid",
+        "print_data", "template_content", "template_version"
+    )
     job_guid: str
     order_guid: str
     print_template_guid: str
@@ -59,12 +171,22 @@ class FailResponse:
 
 class ApiError(Exception):
     """API hatası"""
-    def __init__(self, message: str, error_code: Optional[str] = None):
+    def __init__(
+        self,
+        message: str,
+        error_code: Optional[str] = None,
+        status: Optional[int] = None
+    ):
         self.message = message
         self.error_code = error_code
+        self.status = status  # HTTP status (ağ hatalarında None)
         super().__init__(message)
 
 
+class ApiConnectionError(ApiError):
+    """Ağ hatası (timeout, bağlantı kopması) - backend'e ulaşılamadı"""
+
+
 class FeedemyApiClient:
     """Feedemy Backend API Client with retry and timeout support"""
 
@@ -73,107 +195,175 @@ class FeedemyApiClient:
         base_url: str,
         token: Optional[str] = None,
         timeout: int = DEFAULT_TIMEOUT,
-        max_retries: int = MAX_RETRIES
+        max_retries: int = MAX_RETRIES,
+        batch_size: int = BULK_BATCH_SIZE,
+        template_cache: Optional[Dict[Tuple[str, int], str]] = None,
+        template_etag: Optional[str] = None
     ):
         self.base_url = base_url.rstrip("/")
-        self.token = token
+        # aiohttp base_url sadece origin kabul eder; path varsa endpoint'lerin önüne eklenir
+        base = URL(self.base_url)
+        self._base_origin = base.origin()
+        self._path_prefix = base.path.rstrip("/")
+        self._headers_auth: Mapping[str, str] = BASE_HEADERS
+        self.token = token  # setter auth header'larını hazırlar
         self.timeout = timeout
         self.max_retries = max_retries
+        self.batch_size = batch_size
         self._session: Optional[aiohttp.ClientSession] = None
         self._timeout_config = aiohttp.ClientTimeout(total=timeout)
+        self.events_connected = False  # SSE stream açık mı?
+
+        self._bulk_supported = True  # eski backend'de 404 → tekil endpoint'ler
+
+        # Template cache: (print_template_guid, template_version) → template_content
+        # Server If-None-Match eşleşirse templateContent'i göndermez
+        self.template_cache: Dict[Tuple[str, int], str] = dict(template_cache or {})
+        self.template_etag = template_etag
+        self.template_cache_dirty = False
+
+        # job_guid → JobDetail (LRU, JOB_CACHE_SIZE ile sınırlı)
+        self._job_cache: "OrderedDict[str, JobDetail]" = OrderedDict()
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Lazy session oluştur with connection pooling"""
+        """Lazy session oluştur - paylaşılan connection pool üzerinde"""
         if self._session is None or self._session.closed:
-            connector = aiohttp.TCPConnector(
-                limit=10,  # max connections
-                limit_per_host=5,
-                ttl_dns_cache=300,  # DNS cache 5 minutes
-                enable_cleanup_closed=True
-            )
             self._session = aiohttp.ClientSession(
-                connector=connector,
+                base_url=self._base_origin,
+                connector=_get_shared_connector(),
+                connector_owner=False,  # session.close() havuzu kapatmaz
                 timeout=self._timeout_config
             )
         return self._session
 
     async def close(self) -> None:
-        """Session'ı kapat"""
+        """Session'ı kapat (connector paylaşılan, açık kalır)"""
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
 
-    def _get_headers(self, with_auth: bool = True) -> dict:
-        """HTTP headers"""
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": "FeedemyPrinter/1.0"
-        }
-        if with_auth and self.token:
-            headers["Authorization"] = f"PrinterDevice {self.token}"
-        return headers
-
-    async def _request(
+    def _long_poll_timeout(self, wait_seconds: int) -> aiohttp.ClientTimeout:
+        """Long-poll istekleri için session timeout'unu aşan per-request timeout"""
+        return aiohttp.ClientTimeout(total=max(self.timeout, wait_seconds + LONG_POLL_GRACE))
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @token.setter
+    def token(self, value: Optional[str]) -> None:
+        """Token değişince (register/revoke) auth header'larını bir kez oluştur"""
+        self._token = value
+        if value:
+            self._headers_auth = MappingProxyType({
+                **BASE_HEADERS,
+                "Authorization": f"PrinterDevice {value}"
+            })
+        else:
+            self._headers_auth = BASE_HEADERS
+
+    async def _request_once(
         self,
         method: str,
         endpoint: str,
         json_data: Optional[dict] = None,
         params: Optional[dict] = None,
         with_auth: bool = True,
-        retry: bool = True
-    ) -> dict:
-        """HTTP request with retry and timeout"""
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        extra_headers: Optional[dict] = None,
+        with_etag: bool = False,
+        stream: bool = False
+    ):
+        """
+        Tek HTTP request (retry yok)
+        Idempotent olmayan çağrılar (claim, complete, fail) bunu kullanır -
+        timeout sonrası tekrar denemek job'ı iki kez claim edebilir.
+        stream=True büyük JSON body'leri ijson ile akış halinde parse eder.
+
+        Returns:
+            Response "data" alanı; with_etag=True ise (data, ETag header) tuple'ı
+
+        Raises:
+            ApiConnectionError: timeout / bağlantı hatası
+            ApiError: backend hata döndü (status alanında HTTP kodu)
+        """
         session = await self._get_session()
-        url = f"{self.base_url}{endpoint}"
-        headers = self._get_headers(with_auth)
+        url = f"{self._path_prefix}{endpoint}" if self._path_prefix else endpoint
+        headers = self._headers_auth if with_auth else BASE_HEADERS
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        request_timeout = timeout or self._timeout_config
+
+        try:
+            async with session.request(
+                method,
+                url,
+                data=_json_dumps(json_data) if json_data is not None else None,
+                params=params,
+                headers=headers,
+                timeout=request_timeout
+            ) as response:
+                # Handle non-JSON responses (204 No Content = long-poll timeout)
+                content_type = response.headers.get("Content-Type", "")
+                if "application/json" not in content_type:
+                    if response.status >= 400:
+                        raise ApiError(
+                            f"HTTP {response.status}: {await response.text()}",
+                            status=response.status
+                        )
+                    # Body okunmazsa aiohttp bağlantıyı kapatır; okuyup
+                    # keep-alive havuzuna geri ver (sonraki istek TLS el sıkışması ödemesin)
+                    await response.read()
+                    return (None, response.headers.get("ETag")) if with_etag else None
 
+                data = await _read_json(response, stream)
+
+                # ApiResponse format: { success, message, data, errorCode }
+                if not data.get("success", False):
+                    raise ApiError(
+                        message=data.get("message", "Unknown error"),
+                        error_code=data.get("errorCode"),
+                        status=response.status
+                    )
+
+                if with_etag:
+                    return data.get("data"), response.headers.get("ETag")
+                return data.get("data")
+
+        except asyncio.TimeoutError:
+            raise ApiConnectionError(f"Request timeout after {request_timeout.total}s") from None
+
+        except aiohttp.ClientError as e:
+            raise ApiConnectionError(f"Connection error: {e}") from e
+
+    async def _request_with_retry(self, method: str, endpoint: str, **kwargs):
+        """
+        HTTP request with retry and timeout
+        Ağ hataları ve 5xx'te exponential backoff ile tekrar dener, 4xx'te denemez.
+        Parametreler _request_once ile aynı.
+        """
         last_error = None
-        retries = self.max_retries if retry else 1
+        retries = self.max_retries
 
         for attempt in range(retries):
             try:
-                async with session.request(
-                    method,
-                    url,
-                    json=json_data,
-                    params=params,
-                    headers=headers
-                ) as response:
-                    # Handle non-JSON responses
-                    content_type = response.headers.get("Content-Type", "")
-                    if "application/json" not in content_type:
-                        if response.status >= 400:
-                            raise ApiError(f"HTTP {response.status}: {await response.text()}")
-                        return None
-
-                    data = await response.json()
-
-                    # ApiResponse format: { success, message, data, errorCode }
-                    if not data.get("success", False):
-                        error = ApiError(
-                            message=data.get("message", "Unknown error"),
-                            error_code=data.get("errorCode")
-                        )
-                        # Don't retry on client errors (4xx)
-                        if response.status < 500:
-                            raise error
-                        last_error = error
-                    else:
-                        return data.get("data")
+                return await self._request_once(method, endpoint, **kwargs)
 
-            except asyncio.TimeoutError:
-                last_error = ApiError(f"Request timeout after {self.timeout}s")
-                logger.warning(f"Timeout on {method} {endpoint} (attempt {attempt + 1}/{retries})")
+            except ApiConnectionError as e:
+                last_error = e
+                logger.warning(f"{e.message} on {method} {endpoint} (attempt {attempt + 1}/{retries})")
 
-            except aiohttp.ClientError as e:
-                last_error = ApiError(f"Connection error: {e}")
-                logger.warning(f"Connection error on {method} {endpoint}: {e} (attempt {attempt + 1}/{retries})")
+            except ApiError as e:
+                # Don't retry on client errors (4xx)
+                if e.status is None or e.status < 500:
+                    raise
+                last_error = e
 
-            # Exponential backoff before retry
+            # Exponential backoff before retry (±20% jitter: backend kesintisinden
+            # sonra tüm printer'lar aynı anda tekrar denemesin)
             if attempt < retries - 1:
-                delay = RETRY_DELAY * (2 ** attempt)
-                await asyncio.sleep(delay)
+                delay = _BACKOFFS[min(attempt, len(_BACKOFFS) - 1)]
+                await asyncio.sleep(delay * (0.8 + random.random() * 0.4))
 
         # All retries exhausted
         logger.error(f"All {retries} retries failed for {method} {endpoint}")
@@ -186,9 +376,9 @@ class FeedemyApiClient:
         Pairing code ile cihaz kaydı
         Token döner - config'e kaydedilmeli
         """
-        data = await self._request(
+        data = await self._request_with_retry(
             "POST",
-            "/api/printer-device/register",
+            f"{DEVICE_API}/register",
             json_data={
                 "pairingCode": pairing_code,
                 "deviceName": device_name
@@ -227,9 +417,9 @@ class FeedemyApiClient:
         if sort_order is not None:
             json_data["sortOrder"] = sort_order
 
-        data = await self._request(
+        data = await self._request_with_retry(
             "POST",
-            "/api/printer-device/printers",
+            f"{DEVICE_API}/printers",
             json_data=json_data
         )
 
@@ -239,14 +429,137 @@ class FeedemyApiClient:
             device_address=data.get("deviceAddress")
         )
 
+    # === Push Events (SSE) ===
+
+    async def subscribe_events(
+        self,
+        handler: Callable[[str, dict], Awaitable[None]]
+    ) -> bool:
+        """
+        Server-Sent Events stream'ine abone ol
+        Her olayda handler(event, data) çağrılır (örn. "job-available").
+        Her bağlantı açılışında sentetik "open" olayı gönderilir - bağlantı
+        yokken kaçırılan job'lar için claim tetiklenebilir.
+        Bağlantı koparsa exponential backoff ile yeniden bağlanır.
+
+        Returns:
+            False = endpoint desteklenmiyor (404), long-poll ile devam edilmeli
+        """
+        endpoint = f"{self._path_prefix}{DEVICE_API}/events"
+        stream_timeout = aiohttp.ClientTimeout(total=None, sock_read=EVENTS_READ_TIMEOUT)
+        attempt = 0
+
+        while True:
+            session = await self._get_session()
+            headers = {**self._headers_auth, "Accept": "text/event-stream"}
+            try:
+                async with session.get(
+                    endpoint,
+                    headers=headers,
+                    timeout=stream_timeout
+                ) as response:
+                    if response.status == 404:
+                        logger.info("Event stream not supported by backend, using long-poll")
+                        await response.read()
+                        return False
+                    if response.status >= 400:
+                        raise ApiError(f"HTTP {response.status}: {await response.text()}")
+
+                    self.events_connected = True
+                    attempt = 0
+                    logger.info("Event stream connected")
+                    await self._dispatch_event(handler, "open", {})
+                    await self._read_events(response, handler)
+                    logger.warning("Event stream closed by server")
+
+            except asyncio.TimeoutError:
+                logger.warning(f"Event stream idle for {EVENTS_READ_TIMEOUT}s, reconnecting")
+            except (aiohttp.ClientError, ApiError) as e:
+                logger.warning(f"Event stream error: {e}")
+            finally:
+                self.events_connected = False
+
+            # Exponential backoff before reconnect
+            delay = min(RETRY_DELAY * (2 ** attempt), EVENTS_MAX_BACKOFF)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _read_events(
+        self,
+        response: aiohttp.ClientResponse,
+        handler: Callable[[str, dict], Awaitable[None]]
+    ) -> None:
+        """SSE frame'lerini parse et (event: ... / data: {json} / boş satır)"""
+        buffer = b""
+        event = "message"
+        data_lines: List[str] = []
+
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+
+            for raw in lines:
+                line = raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+                # Boş satır = frame sonu
+                if not line:
+                    if data_lines or event != "message":
+                        await self._dispatch_event(handler, event, self._parse_event_data(data_lines))
+                    event = "message"
+                    data_lines = []
+                    continue
+
+                # ":" ile başlayan satırlar yorum/heartbeat
+                if line.startswith(":"):
+                    continue
+
+                field, _, value = line.partition(":")
+                if value.startswith(" "):
+                    value = value[1:]
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data_lines.append(value)
+
+    @staticmethod
+    def _parse_event_data(data_lines: List[str]) -> dict:
+        """SSE data satırlarını JSON olarak parse et"""
+        if not data_lines:
+            return {}
+        try:
+            data = _json_loads("\n".join(data_lines))
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    async def _dispatch_event(
+        self,
+        handler: Callable[[str, dict], Awaitable[None]],
+        event: str,
+        data: dict
+    ) -> None:
+        """Handler hatası stream'i düşürmesin"""
+        try:
+            await handler(event, data)
+        except Exception as e:
+            logger.error(f"Event handler error ({event}): {e}")
+
     # === Job Polling ===
 
-    async def get_pending_jobs(self, take: int = 10) -> List[PendingJob]:
-        """Bekleyen jobları listele"""
-        data = await self._request(
+    async def get_pending_jobs(
+        self,
+        take: int = 10,
+        wait_seconds: int = LONG_POLL_WAIT
+    ) -> List[PendingJob]:
+        """
+        Bekleyen jobları listele (long-poll)
+        Server job gelene kadar ya da wait_seconds dolana kadar bekletir
+        """
+        data = await self._request_with_retry(
             "GET",
-            "/api/printer-device/jobs/pending",
-            params={"take": take}
+            f"{JOBS_API}/pending",
+            params={"take": take, "wait": wait_seconds},
+            timeout=self._long_poll_timeout(wait_seconds)
         )
 
         if not data:
@@ -262,69 +575,300 @@ class FeedemyApiClient:
             for job in data
         ]
 
-    async def claim_next_job(self) -> Optional[JobDetail]:
-        """Sonraki job'ı claim et ve detayını al"""
-        data = await self._request(
+    async def claim_next_job(self, wait_seconds: int = LONG_POLL_WAIT) -> Optional[JobDetail]:
+        """
+        Sonraki job'ı claim et ve detayını al (long-poll)
+        Server job gelene kadar ya da wait_seconds dolana kadar bekletir.
+        204 / boş body = job yok, hemen tekrar claim edilebilir.
+        """
+        conditional_headers = self._conditional_headers()
+        data, etag = await self._request_once(
             "POST",
-            "/api/printer-device/jobs/claim"
+            f"{JOBS_API}/claim",
+            params={"wait": wait_seconds},
+            timeout=self._long_poll_timeout(wait_seconds),
+            extra_headers=conditional_headers,
+            with_etag=True,
+            stream=True
         )
 
         if not data:
             return None
 
-        return JobDetail(
-            job_guid=data["jobGuid"],
-            order_guid=data["orderGuid"],
-            print_template_guid=data["printTemplateGuid"],
-            print_data=data["printData"],
-            template_content=data.get("templateContent", "{}"),
-            template_version=data.get("templateVersion", 1)
-        )
+        job = self._parse_job_detail(data, etag, conditional=conditional_headers is not None)
+        if job is None:
+            # Template cache'te yok - koşulsuz iste
+            return await self.get_job_detail(data["jobGuid"], conditional=False)
+        return job
+
+    async def claim_next_jobs(
+        self,
+        max_jobs: int,
+        wait_seconds: int = LONG_POLL_WAIT
+    ) -> List[JobDetail]:
+        """
+        Kuyruk boşalana kadar (en fazla max_jobs) job claim et
+        İlk claim long-poll, sonrakiler claim_more_jobs ile beklemesiz.
+        """
+        job = await self.claim_next_job(wait_seconds=wait_seconds)
+        if job is None:
+            return []
+        return [job] + await self.claim_more_jobs(max_jobs - 1)
+
+    async def claim_more_jobs(self, max_jobs: int) -> List[JobDetail]:
+        """
+        Beklemeden en fazla max_jobs job daha claim et (ilk claim'in devamı)
+        Hatalar yutulur - o ana kadar claim edilmiş job'lar kaybolmasın.
+        Çağıran bu aşamayı iptal etmemeli: iptal, claim edilmiş listeyi düşürür.
+        """
+        jobs: List[JobDetail] = []
+        while len(jobs) < max_jobs:
+            try:
+                job = await self.claim_next_job(wait_seconds=0)
+            except ApiError as e:
+                logger.debug(f"Batch claim stopped after {len(jobs)} extra jobs: {e.message}")
+                break
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+
+    async def get_job_detail(self, job_guid: str, conditional: bool = True) -> Optional[JobDetail]:
+        """Job detayını al (retry için) - claim edilmiş job'lar cache'ten döner"""
+        cached = self._job_cache.get(job_guid)
+        if cached is not None:
+            self._job_cache.move_to_end(job_guid)
+            return cached
 
-    async def get_job_detail(self, job_guid: str) -> Optional[JobDetail]:
-        """Job detayını al (retry için)"""
         try:
-            data = await self._request(
+            conditional_headers = self._conditional_headers() if conditional else None
+            data, etag = await self._request_with_retry(
                 "GET",
-                f"/api/printer-device/jobs/{job_guid}"
+                f"{JOBS_API}/{job_guid}",
+                extra_headers=conditional_headers,
+                with_etag=True,
+                stream=True
             )
 
             if not data:
                 return None
 
-            return JobDetail(
-                job_guid=data["jobGuid"],
-                order_guid=data["orderGuid"],
-                print_template_guid=data["printTemplateGuid"],
-                print_data=data["printData"],
-                template_content=data.get("templateContent", "{}"),
-                template_version=data.get("templateVersion", 1)
-            )
+            job = self._parse_job_detail(data, etag, conditional=conditional_headers is not None)
+            if job is None:
+                return await self.get_job_detail(job_guid, conditional=False)
+            return job
         except ApiError:
             return None
 
+    def _parse_job_detail(
+        self,
+        data: dict,
+        etag: Optional[str],
+        conditional: bool
+    ) -> Optional[JobDetail]:
+        """
+        API response → JobDetail (cache'e de eklenir)
+
+        Returns:
+            JobDetail, koşullu istekte template cache'te yoksa None
+        """
+        template_content = self._resolve_template_content(data, etag, conditional)
+        if template_content is None:
+            return None
+
+        job = JobDetail(
+            job_guid=data["jobGuid"],
+            order_guid=data["orderGuid"],
+            print_template_guid=data["printTemplateGuid"],
+            print_data=data["printData"],
+            template_content=template_content,
+            template_version=data.get("templateVersion", 1)
+        )
+
+        # LRU: en eski girdi düşer; complete/fail sonrası zaten silinir
+        self._job_cache[job.job_guid] = job
+        self._job_cache.move_to_end(job.job_guid)
+        if len(self._job_cache) > JOB_CACHE_SIZE:
+            self._job_cache.popitem(last=False)
+        return job
+
+    def _conditional_headers(self) -> Optional[dict]:
+        """Son alınan template'in ETag'i ile If-None-Match header'ı"""
+        if self.template_etag:
+            return {"If-None-Match": self.template_etag}
+        return None
+
+    def _resolve_template_content(
+        self,
+        data: dict,
+        etag: Optional[str],
+        conditional: bool
+    ) -> Optional[str]:
+        """
+        Response'taki templateContent'i cache'le ya da cache'ten tamamla
+
+        Returns:
+            Template JSON string, koşullu istekte cache'te bulunamazsa None
+        """
+        key = (data["printTemplateGuid"], data.get("templateVersion", 1))
+        content = data.get("templateContent")
+
+        if content:
+            if self.template_cache.get(key) != content:
+                # Aynı template'in eski versiyonlarını at
+                for old_key in [k for k in self.template_cache if k[0] == key[0]]:
+                    del self.template_cache[old_key]
+                self.template_cache[key] = content
+                self.template_cache_dirty = True
+            if etag and etag != self.template_etag:
+                self.template_etag = etag
+                self.template_cache_dirty = True
+            return content
+
+        # Not modified - cache'ten al
+        cached = self.template_cache.get(key)
+        if cached is not None:
+            return cached
+        if not conditional:
+            return "{}"
+        logger.warning(f"Template {key[0]} v{key[1]} not in cache, refetching")
+        return None
+
     # === Job Status ===
 
     async def complete_job(self, job_guid: str) -> bool:
-        """Job'ı tamamlandı olarak işaretle"""
+        """Job'ı tamamlandı olarak işaretle (batch için complete_jobs)"""
         try:
-            await self._request(
-                "POST",
-                f"/api/printer-device/jobs/{job_guid}/complete"
-            )
-            return True
+            result = (await self._send_status_batch([(job_guid, None)]))[job_guid]
         except ApiError as e:
-            logger.error(f"Failed to complete job {job_guid}: {e.message}")
+            result = e
+        if isinstance(result, ApiError):
+            logger.error(f"Failed to complete job {job_guid}: {result.message}")
             return False
+        return True
 
     async def fail_job(self, job_guid: str, error_message: str) -> FailResponse:
-        """Job'ı başarısız olarak işaretle"""
-        data = await self._request(
-            "POST",
-            f"/api/printer-device/jobs/{job_guid}/fail",
-            json_data={"errorMessage": error_message}
+        """Job'ı başarısız olarak işaretle (batch için fail_jobs)"""
+        result = (await self._send_status_batch([(job_guid, error_message)]))[job_guid]
+        if isinstance(result, ApiError):
+            raise result
+        return result
+
+    async def complete_jobs(self, job_guids: List[str]) -> Dict[str, bool]:
+        """Birden fazla job'ı tek istekte tamamlandı olarak işaretle"""
+        results = await self._send_status_batch(
+            [(guid, None) for guid in job_guids]
         )
+        return {
+            guid: not isinstance(result, ApiError)
+            for guid, result in results.items()
+        }
+
+    async def fail_jobs(self, failures: List[Tuple[str, str]]) -> Dict[str, FailResponse]:
+        """Birden fazla job'ı tek istekte başarısız olarak işaretle"""
+        results = await self._send_status_batch(failures)
+        for result in results.values():
+            if isinstance(result, ApiError):
+                raise result
+        return results
+
+    async def _send_status_batch(
+        self,
+        updates: List[Tuple[str, Optional[str]]]
+    ) -> Dict[str, object]:
+        """
+        Durum güncellemelerini gönder (bulk istek başına en fazla batch_size)
+
+        Args:
+            updates: (job_guid, error_message) listesi - error_message None = completed
 
-        return FailResponse(
-            will_retry=data.get("willRetry", False) if data else False
+        Returns:
+            job_guid → True (completed) / FailResponse (failed) / ApiError
+        """
+        results: Dict[str, object] = {}
+        for start in range(0, len(updates), self.batch_size):
+            results.update(
+                await self._send_status_updates(updates[start:start + self.batch_size])
+            )
+
+        # Durumu bildirilen job'lar artık tekrar istenmeyecek
+        for guid, result in results.items():
+            if not isinstance(result, Exception):
+                self._job_cache.pop(guid, None)
+        return results
+
+    async def _send_status_updates(
+        self,
+        updates: List[Tuple[str, Optional[str]]]
+    ) -> Dict[str, object]:
+        """Bulk endpoint'e gönder; desteklenmiyorsa tekil endpoint'lere düş"""
+        if self._bulk_supported:
+            try:
+                return await self._post_bulk_status(updates)
+            except ApiError as e:
+                if e.status not in (404, 405):
+                    raise
+                # Eski backend - tekil endpoint'lere düş
+                logger.info("Bulk status endpoint not available, using per-job endpoints")
+                self._bulk_supported = False
+
+        results: Dict[str, object] = {}
+        for guid, error in updates:
+            try:
+                if error is None:
+                    await self._request_once(
+                        "POST",
+                        f"{JOBS_API}/{guid}/complete"
+                    )
+                    results[guid] = True
+                else:
+                    data = await self._request_once(
+                        "POST",
+                        f"{JOBS_API}/{guid}/fail",
+                        json_data={"errorMessage": error}
+                    )
+                    results[guid] = FailResponse(
+                        will_retry=data.get("willRetry", False) if data else False
+                    )
+            except ApiError as e:
+                results[guid] = e
+        return results
+
+    async def _post_bulk_status(
+        self,
+        updates: List[Tuple[str, Optional[str]]]
+    ) -> Dict[str, object]:
+        """POST /jobs/bulk-status - { completed: [guid], failed: [{jobGuid, errorMessage}] }"""
+        completed = [guid for guid, error in updates if error is None]
+        failed = [
+            {"jobGuid": guid, "errorMessage": error}
+            for guid, error in updates if error is not None
+        ]
+
+        data = await self._request_once(
+            "POST",
+            f"{JOBS_API}/bulk-status",
+            json_data={"completed": completed, "failed": failed}
         )
+
+        # Response: { completed: [guid], failed: [{jobGuid, willRetry}] }
+        # Body yoksa hepsi kabul edildi sayılır
+        if not data:
+            accepted = set(completed)
+            will_retry: Dict[str, bool] = {}
+        else:
+            accepted = set(data.get("completed", completed))
+            will_retry = {
+                f["jobGuid"]: f.get("willRetry", False)
+                for f in data.get("failed", [])
+            }
+
+        results: Dict[str, object] = {}
+        for guid in completed:
+            results[guid] = True if guid in accepted else ApiError(
+                f"Job not accepted as completed: {guid}"
+            )
+        for entry in failed:
+            guid = entry["jobGuid"]
+            results[guid] = FailResponse(will_retry=will_retry.get(guid, False))
+        return results
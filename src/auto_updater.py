@@ -5,10 +5,9 @@ Başlangıçta çalışır, güncelleme varsa systemctl restart yapar
 
 import subprocess
 import logging
-import hashlib
 import sys
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -38,32 +37,32 @@ class AutoUpdater:
         try:
             logger.info("Checking for updates...")
 
-            # 1. Git fetch
-            if not self._git_fetch():
+            # 1. Local HEAD + remote HEAD (ls-remote - pack indirmez)
+            local_hash, remote_hash = self._peek_heads()
+            if not remote_hash:
                 return False
 
             # 2. Local vs Remote karşılaştır
-            local_hash, remote_hash = self._get_commits()
             if local_hash == remote_hash:
                 logger.info("Already up to date")
                 return False
 
             logger.info(f"Update available: {local_hash[:8]} → {remote_hash[:8]}")
 
-            # 3. requirements.txt hash'ini kaydet (pip install gerekli mi?)
-            old_req_hash = self._get_file_hash(self.requirements_path)
-
-            # 4. Git pull
+            # 3. Git pull (asıl fetch burada yapılır)
             if not self._git_pull():
                 return False
 
-            # 5. requirements.txt değişti mi?
-            new_req_hash = self._get_file_hash(self.requirements_path)
-            if old_req_hash != new_req_hash:
-                logger.info("requirements.txt changed, installing dependencies...")
+            # 4. requirements.txt'te bu pull'da değişen paketleri kur
+            changed = self._changed_requirements(local_hash)
+            if changed is None:
+                logger.info("requirements.txt diff unavailable, installing all dependencies...")
                 self._pip_install()
+            elif changed:
+                logger.info(f"requirements.txt changed, installing: {' '.join(changed)}")
+                self._pip_install(changed)
 
-            # 6. Restart
+            # 5. Restart
             logger.info("Update complete, restarting service...")
             self._restart_service()
 
@@ -73,40 +72,85 @@ class AutoUpdater:
             logger.error(f"Update check failed: {e}")
             return False
 
-    def _git_fetch(self) -> bool:
-        """git fetch origin"""
+    def _peek_heads(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Local HEAD ve remote branch HEAD'ini al
+        Local HEAD .git'ten okunur; tek git process'i ls-remote (her git spawn'ı
+        Pi'de ~30-80ms; ls-remote tek round-trip, pack transferi yok)
+        """
+        local_hash = self._read_local_head()
+        if local_hash is None:
+            result = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                logger.error(f"git rev-parse failed: {result.stderr}")
+                return None, None
+            local_hash = result.stdout.strip()
+
         result = subprocess.run(
-            ["git", "fetch", "origin", self.branch],
+            ["git", "ls-remote", "origin", f"refs/heads/{self.branch}"],
             cwd=self.repo_path,
             capture_output=True,
             text=True
         )
         if result.returncode != 0:
-            logger.error(f"git fetch failed: {result.stderr}")
-            return False
-        return True
+            logger.error(f"git ls-remote failed: {result.stderr}")
+            return local_hash, None
 
-    def _get_commits(self) -> Tuple[str, str]:
-        """Local ve remote commit hash'lerini al"""
-        # Local HEAD
-        local = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True
-        )
-        local_hash = local.stdout.strip()
+        remote_hash = result.stdout[:40]
+        if len(remote_hash) != 40:
+            logger.error(f"Remote branch not found: {self.branch}")
+            return local_hash, None
+        return local_hash, remote_hash
 
-        # Remote HEAD
-        remote = subprocess.run(
-            ["git", "rev-parse", f"origin/{self.branch}"],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True
-        )
-        remote_hash = remote.stdout.strip()
+    def _read_local_head(self) -> Optional[str]:
+        """
+        HEAD commit hash'ini .git/HEAD → ref dosyası / packed-refs'ten oku
 
-        return local_hash, remote_hash
+        Returns:
+            40 karakterlik hash, None = okunamadı (git rev-parse'a düşülür)
+        """
+        try:
+            git_dir = self.repo_path / ".git"
+            if git_dir.is_file():
+                # Worktree/submodule: ".git" dosyası "gitdir: <yol>" içerir
+                git_dir = self.repo_path / git_dir.read_text().split(":", 1)[1].strip()
+            common_dir = git_dir
+            if (git_dir / "commondir").is_file():
+                common_dir = git_dir / (git_dir / "commondir").read_text().strip()
+
+            head = (git_dir / "HEAD").read_text().strip()
+            if head.startswith("ref: "):
+                ref = head[5:]
+                ref_file = common_dir / ref
+                if ref_file.is_file():
+                    head = ref_file.read_text().strip()
+                else:
+                    head = self._read_packed_ref(common_dir / "packed-refs", ref)
+            # Detached HEAD: dosyada doğrudan hash var
+        except (OSError, IndexError) as e:
+            logger.debug(f"Could not read HEAD from .git: {e}")
+            return None
+
+        if head and len(head) == 40:
+            return head
+        return None
+
+    @staticmethod
+    def _read_packed_ref(packed_refs: Path, ref: str) -> Optional[str]:
+        """packed-refs satırı: "<hash> <ref>" (# başlık ve ^peeled satırları atlanır)"""
+        if not packed_refs.is_file():
+            return None
+        with open(packed_refs) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+        return None
 
     def _git_pull(self) -> bool:
         """git pull origin branch"""
@@ -123,22 +167,58 @@ class AutoUpdater:
         logger.info(f"git pull: {result.stdout}")
         return True
 
-    def _get_file_hash(self, path: Path) -> str:
-        """Dosya hash'i (MD5)"""
-        if not path.exists():
-            return ""
-        with open(path, "rb") as f:
-            return hashlib.md5(f.read()).hexdigest()
+    def _changed_requirements(self, old_hash: str) -> Optional[List[str]]:
+        """
+        old_hash..HEAD aralığında requirements.txt'e eklenen/değişen paket satırları
 
-    def _pip_install(self) -> bool:
-        """pip install -r requirements.txt using venv pip"""
-        # Use venv pip if available, otherwise fall back to system pip
-        pip_cmd = str(self.venv_pip) if self.venv_pip.exists() else sys.executable + " -m pip"
+        Returns:
+            Paket spec listesi (boş = değişiklik yok), None = tam kurulum gerekli
+        """
+        result = subprocess.run(
+            ["git", "diff", "-U0", f"{old_hash}..HEAD", "--", "requirements.txt"],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            # Emin olamıyoruz - güvenli tarafta kal
+            logger.warning(f"git diff failed: {result.stderr}")
+            return None
+
+        added, removed = [], set()
+        for line in result.stdout.splitlines():
+            if line.startswith(("+++", "---")) or not line.startswith(("+", "-")):
+                continue
+            spec = line[1:].split(" #", 1)[0].strip()
+            if not spec or spec.startswith("#"):
+                continue  # boş satır / yorum
+            if spec.startswith("-"):
+                return None  # -r, --index-url gibi pip seçenekleri
+            if line.startswith("+"):
+                added.append(spec)
+            else:
+                removed.add(spec)
+
+        # Aynı spec hem silinip hem eklendiyse sadece format değişmiştir
+        return [spec for spec in added if spec not in removed]
+
+    def _pip_install(self, packages: Optional[List[str]] = None) -> bool:
+        """
+        pip install using venv pip
 
+        Args:
+            packages: Sadece bu paketleri güncelle (None = pip install -r requirements.txt)
+        """
+        # Use venv pip if available, otherwise fall back to system pip
         if self.venv_pip.exists():
-            cmd = [str(self.venv_pip), "install", "-r", str(self.requirements_path)]
+            cmd = [str(self.venv_pip), "install"]
+        else:
+            cmd = [sys.executable, "-m", "pip", "install"]
+
+        if packages:
+            cmd += ["--upgrade", *packages]
         else:
-            cmd = [sys.executable, "-m", "pip", "install", "-r", str(self.requirements_path)]
+            cmd += ["-r", str(self.requirements_path)]
 
         result = subprocess.run(
             cmd,
@@ -4,10 +4,19 @@ Token register sonrası buraya kaydedilir
 """
 
 import json
+import os
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 
+# orjson opsiyonel - yoksa stdlib json kullanılır
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 @dataclass
 class ApiConfig:
@@ -26,6 +35,7 @@ class DeviceConfig:
 class PollingConfig:
     interval_seconds: int = 5
     batch_size: int = 10
+    wait_seconds: int = 25  # long-poll bekleme süresi
 
 
 @dataclass
@@ -40,6 +50,10 @@ class AutoUpdateConfig:
     branch: str = "main"
 
 
+# cached_property ile tutulan section'lar - _data değişince düşürülür
+_CACHED_SECTIONS = ("api", "device", "polling", "printer", "auto_update")
+
+
 class ConfigManager:
     """Config dosyası yönetimi"""
 
@@ -51,6 +65,7 @@ class ConfigManager:
 
         self.config_path = Path(config_path)
         self._data: dict = {}
+        self._last_written: Optional[bytes] = None  # diske yazılan son içerik
         self.load()
 
     def load(self) -> None:
@@ -60,16 +75,48 @@ class ConfigManager:
             self.save()
             return
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self._data = json.load(f)
+        raw = self.config_path.read_bytes()
+        if ORJSON_AVAILABLE:
+            self._data = orjson.loads(raw)
+        else:
+            self._data = json.loads(raw)
+        self._invalidate_sections()
+        self._last_written = self._serialize()
 
     def save(self) -> None:
-        """Config dosyasını kaydet"""
+        """
+        Config dosyasını kaydet
+        İçerik değişmediyse yazmaz (SD kart ömrü); yazarken önce .tmp dosyasına
+        yazıp os.replace ile atomik olarak değiştirir (yarım yazılmış config olmaz)
+        """
+        # Tüm update_* / save_* metodları _data'yı değiştirip save() çağırır
+        self._invalidate_sections()
+
+        raw = self._serialize()
+        if raw == self._last_written:
+            return
+
         # config dizini yoksa oluştur
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        tmp_path = self.config_path.with_suffix(".json.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.config_path)
+        self._last_written = raw
+
+    def _invalidate_sections(self) -> None:
+        """Cache'lenmiş section dataclass'larını düşür (sonraki erişimde yeniden oluşur)"""
+        for name in _CACHED_SECTIONS:
+            self.__dict__.pop(name, None)
+
+    def _serialize(self) -> bytes:
+        """Config'i JSON bytes'a çevir (2 boşluk girinti, UTF-8)"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self._data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self._data, indent=2, ensure_ascii=False).encode("utf-8")
 
     def _get_default_config(self) -> dict:
         """Varsayılan config"""
@@ -85,7 +132,8 @@ class ConfigManager:
             },
             "polling": {
                 "interval_seconds": 5,
-                "batch_size": 10
+                "batch_size": 10,
+                "wait_seconds": 25
             },
             "printer": {
                 "default_width": 48,
@@ -98,8 +146,10 @@ class ConfigManager:
         }
 
     # === Property Accessors ===
+    # Section'lar ilk erişimde oluşturulup cache'lenir (polling döngüsü her
+    # turda config.polling okur); load()/save() cache'i düşürür.
 
-    @property
+    @cached_property
     def api(self) -> ApiConfig:
         api_data = self._data.get("api", {})
         return ApiConfig(
@@ -107,7 +157,7 @@ class ConfigManager:
             token=api_data.get("token")
         )
 
-    @property
+    @cached_property
     def device(self) -> DeviceConfig:
         dev_data = self._data.get("device", {})
         return DeviceConfig(
@@ -116,15 +166,16 @@ class ConfigManager:
             token_id=dev_data.get("token_id")
         )
 
-    @property
+    @cached_property
     def polling(self) -> PollingConfig:
         poll_data = self._data.get("polling", {})
         return PollingConfig(
             interval_seconds=poll_data.get("interval_seconds", 5),
-            batch_size=poll_data.get("batch_size", 10)
+            batch_size=poll_data.get("batch_size", 10),
+            wait_seconds=poll_data.get("wait_seconds", 25)
         )
 
-    @property
+    @cached_property
     def printer(self) -> PrinterConfig:
         printer_data = self._data.get("printer", {})
         return PrinterConfig(
@@ -132,7 +183,7 @@ class ConfigManager:
             charset=printer_data.get("charset", "cp857")
         )
 
-    @property
+    @cached_property
     def auto_update(self) -> AutoUpdateConfig:
         update_data = self._data.get("auto_update", {})
         return AutoUpdateConfig(
@@ -176,25 +227,38 @@ class ConfigManager:
         """Kayıtlı yazıcı device_address listesi"""
         return self._data.get("registered_printers", [])
 
-    def add_registered_printer(self, device_address: str, printer_guid: str) -> None:
+    def add_registered_printer(
+        self,
+        device_address: str,
+        printer_guid: str,
+        signature: Optional[str] = None
+    ) -> None:
         """Yazıcıyı kayıtlı listesine ekle"""
         if "registered_printers" not in self._data:
             self._data["registered_printers"] = []
 
         # Zaten varsa ekleme
-        for p in self._data["registered_printers"]:
-            if p.get("device_address") == device_address:
-                return
+        if self.is_printer_registered(device_address, signature):
+            return
 
-        self._data["registered_printers"].append({
+        entry = {
             "device_address": device_address,
             "printer_guid": printer_guid
-        })
+        }
+        if signature:
+            entry["signature"] = signature
+        self._data["registered_printers"].append(entry)
         self.save()
 
-    def is_printer_registered(self, device_address: str) -> bool:
-        """Bu device_address kayıtlı mı?"""
+    def is_printer_registered(self, device_address: str, signature: Optional[str] = None) -> bool:
+        """
+        Bu yazıcı kayıtlı mı?
+        signature (vendor:product:serial) verilirse farklı device_address'e
+        takılmış aynı yazıcı da kayıtlı sayılır
+        """
         for p in self._data.get("registered_printers", []):
             if p.get("device_address") == device_address:
                 return True
+            if signature and p.get("signature") == signature:
+                return True
         return False
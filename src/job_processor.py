@@ -5,15 +5,19 @@ API'den job al, render et, yazdır, raporla
 
 import asyncio
 import logging
-from typing import Optional
+import random
+from typing import Optional, List, Tuple
 
-from .api_client import FeedemyApiClient, JobDetail, ApiError
-from .job_store import JobStore
+from .api_client import FeedemyApiClient, JobDetail, ApiError, ApiConnectionError
+from .job_store import JobStore, MARK_FLUSH_INTERVAL
 from .template_renderer import TemplateRenderer
 from .printer_manager import PrinterManager
 
 logger = logging.getLogger(__name__)
 
+RENDER_QUEUE_SIZE = 2  # yazdırılmayı bekleyen max render edilmiş job
+IDLE_BACKOFF_MIN = 0.2  # seconds - boş kuyrukta ilk bekleme (poll_interval'e kadar ikiye katlanır)
+
 
 class JobProcessor:
     """Print job işleme döngüsü"""
@@ -24,118 +28,277 @@ class JobProcessor:
         store: JobStore,
         renderer: TemplateRenderer,
         printer_manager: PrinterManager,
-        poll_interval: int = 5
+        poll_interval: int = 5,
+        wait_seconds: int = 25,
+        max_batch: int = 10
     ):
         self.api = api
         self.store = store
         self.renderer = renderer
         self.printer_manager = printer_manager
         self.poll_interval = poll_interval
+        self.wait_seconds = wait_seconds
+        self.max_batch = max(1, max_batch)
         self._running = False
+        self._claim_task: Optional[asyncio.Task] = None
+        self._events_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._job_available: Optional[asyncio.Event] = None
 
     async def run(self) -> None:
         """Ana işleme döngüsü"""
         self._running = True
-        logger.info(f"Job processor started (poll interval: {self.poll_interval}s)")
+        logger.info(
+            f"Job processor started (long-poll wait: {self.wait_seconds}s, "
+            f"poll interval: {self.poll_interval}s)"
+        )
 
         # Eski kayıtları temizle
-        self.store.cleanup_old(days=7)
+        await asyncio.to_thread(self.store.cleanup_old, days=7)
 
-        while self._running:
-            try:
-                await self._process_next_job()
-            except Exception as e:
-                logger.error(f"Job processing error: {e}")
+        # Push olayları (SSE) - desteklenmiyorsa long-poll ile devam
+        self._job_available = asyncio.Event()
+        self._events_task = asyncio.ensure_future(self._listen_events())
+        self._flush_task = asyncio.ensure_future(self._flush_store())
 
-            await asyncio.sleep(self.poll_interval)
+        loop = asyncio.get_running_loop()
+        idle_delay = IDLE_BACKOFF_MIN
+
+        try:
+            while self._running:
+                # Yazıcı bağlı değilse bekle
+                if not self.printer_manager.has_printer():
+                    logger.debug("No printer connected, waiting...")
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                # Bekleme yok - push olayı ya da long-poll claim hızı belirler
+                try:
+                    if self.api.events_connected:
+                        await self._wait_for_push()
+                        if not self._running:
+                            break
+                    started = loop.time()
+                    if await self._process_next_job():
+                        idle_delay = IDLE_BACKOFF_MIN
+                        if self.api.events_connected:
+                            # Kuyrukta başka job olabilir - boşalana kadar claim et
+                            self._job_available.set()
+                    elif not self.api.events_connected:
+                        # Long-poll sunucuda beklediyse ek bekleme yok; hemen dönen
+                        # (long-poll desteklemeyen) backend'de bekleme artarak uzar
+                        elapsed = loop.time() - started
+                        if elapsed < idle_delay:
+                            await asyncio.sleep(idle_delay - elapsed)
+                        idle_delay = min(idle_delay * 2, self.poll_interval)
+                except ApiConnectionError as e:
+                    # Reconnect storm'u önlemek için küçük jitter
+                    logger.warning(f"Connection problem: {e.message}")
+                    await asyncio.sleep(random.uniform(0.1, 1.0))
+                except Exception as e:
+                    logger.error(f"Job processing error: {e}")
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self._events_task.cancel()
+            self._flush_task.cancel()
+            await asyncio.to_thread(self.store.flush)
 
     async def stop(self) -> None:
         """İşleme döngüsünü durdur"""
         self._running = False
+        # Bekleyen long-poll'u / push beklemesini beklemeden kapat
+        if self._claim_task and not self._claim_task.done():
+            self._claim_task.cancel()
+        if self._job_available:
+            self._job_available.set()
         logger.info("Job processor stopping...")
 
-    async def _process_next_job(self) -> None:
-        """Sonraki job'ı işle"""
-        # Yazıcı bağlı değilse bekle
-        if not self.printer_manager.has_printer():
-            logger.debug("No printer connected, waiting...")
-            return
-
-        # Job claim et
-        job = await self._claim_job()
-        if not job:
-            return  # Job yok
-
-        job_guid = job.job_guid
-        logger.info(f"Processing job: {job_guid}")
-
-        # Daha önce işlendi mi? (duplicate check)
-        if self.store.is_processed(job_guid):
-            logger.warning(f"Job already processed locally: {job_guid}")
-            # Backend'e complete gönder (idempotent)
-            await self.api.complete_job(job_guid)
-            return
-
-        # Template render et
-        escpos_data = self._render_job(job)
-        if not escpos_data:
-            await self._fail_job(job_guid, "Template render failed")
-            return
+    async def _listen_events(self) -> None:
+        """SSE stream'ini dinle (arka plan task'ı)"""
+        supported = await self.api.subscribe_events(self._on_event)
+        if not supported:
+            logger.info("Push events unavailable, falling back to long-poll")
+
+    async def _flush_store(self) -> None:
+        """Biriken job kayıtlarını periyodik olarak SQLite'a yaz (arka plan task'ı)"""
+        while True:
+            await asyncio.sleep(MARK_FLUSH_INTERVAL)
+            try:
+                await asyncio.to_thread(self.store.flush)
+            except Exception as e:
+                logger.error(f"Job store flush failed: {e}")
+
+    async def _on_event(self, event: str, data: dict) -> None:
+        """Push olayı geldi - ana döngüyü uyandır"""
+        if event in ("open", "job-available"):
+            logger.debug(f"Push event: {event} {data}")
+            self._job_available.set()
+
+    async def _wait_for_push(self) -> None:
+        """job-available olayını bekle (kaçan olaylar için wait_seconds'ta bir claim)"""
+        try:
+            await asyncio.wait_for(self._job_available.wait(), timeout=self.wait_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._job_available.clear()
+
+    async def _process_next_job(self) -> bool:
+        """
+        Sonraki job'ları işle (en fazla max_batch)
+        Yazıcı tek; yazdırma sıralı, render ayrı task'ta yazdırmayla paralel ilerler.
+        Batch'in sonuçları sonda tek complete + tek fail isteğiyle bildirilir.
 
-        # Yazdır
-        result = self.printer_manager.print_data(escpos_data)
+        Returns:
+            True = en az bir job claim edildi, False = job yok
+        """
+        # Job'ları claim et
+        jobs = await self._claim_jobs()
+        if not jobs:
+            return False  # Job yok
 
-        if result.success:
-            await self._complete_job(job_guid)
+        completed: List[str] = []
+        failed: List[Tuple[str, str]] = []
+        pending = []
+        for job in jobs:
+            # Daha önce işlendi mi? (duplicate check)
+            if self.store.is_processed(job.job_guid):
+                logger.warning(f"Job already processed locally: {job.job_guid}")
+                # Backend'e complete gönder (idempotent)
+                completed.append(job.job_guid)
+            else:
+                pending.append(job)
+
+        # Render (CPU, thread) → kuyruk → yazdırma (USB I/O, thread)
+        # Kuyruk sınırlı: render yazıcının en fazla RENDER_QUEUE_SIZE job önünde gider
+        rendered: asyncio.Queue = asyncio.Queue(maxsize=RENDER_QUEUE_SIZE)
+        producer = asyncio.ensure_future(self._render_jobs(pending, rendered))
+        try:
+            while True:
+                item = await rendered.get()
+                if item is None:
+                    break
+                job, escpos_data = item
+                try:
+                    error = await self._print_job(job, escpos_data)
+                except Exception as e:
+                    # Tek job'ın hatası batch'in geri kalanını düşürmesin
+                    logger.error(f"Print error for job {job.job_guid}: {e}")
+                    error = f"Print error: {e}"
+                    await self._mark_failed(job.job_guid, error)
+                if error is None:
+                    completed.append(job.job_guid)
+                else:
+                    failed.append((job.job_guid, error))
+        finally:
+            producer.cancel()
+            # İptalde sırası gelmeyen job'lar da bildirilsin - backend tekrar kuyruğa alır
+            # (yazdırılmadıkları için local store'a işlenmez)
+            handled = set(completed).union(guid for guid, _ in failed)
+            failed.extend(
+                (job.job_guid, "Print interrupted")
+                for job in pending if job.job_guid not in handled
+            )
+            await self._report_results(completed, failed)
+        return True
+
+    async def _render_jobs(self, jobs: List[JobDetail], rendered: asyncio.Queue) -> None:
+        """Producer: job'ları sırayla render edip kuyruğa koy (None = bitti)"""
+        for job in jobs:
+            escpos_data = await asyncio.to_thread(self._render_job, job)
+            await rendered.put((job, escpos_data))
+        await rendered.put(None)
+
+    async def _print_job(self, job: JobDetail, escpos_data: Optional[List[bytes]]) -> Optional[str]:
+        """
+        Consumer: render edilmiş job'ı yazdır ve sonucu SQLite'a kaydet
+
+        Returns:
+            None = yazdırıldı, aksi halde hata mesajı
+        """
+        logger.info(f"Processing job: {job.job_guid}")
+        if not escpos_data:
+            error = "Template render failed"
         else:
-            await self._fail_job(job_guid, result.error or "Print failed")
+            # Yazdır (USB I/O thread'de - sıradaki render ile paralel)
+            result = await self.printer_manager.print_parts_async(escpos_data)
+            error = None if result.success else (result.error or "Print failed")
 
-    async def _claim_job(self) -> Optional[JobDetail]:
-        """API'den job claim et"""
+        # SQLite'a kaydet (fsync event loop'u bloklamasın)
+        if error is None:
+            await asyncio.to_thread(self.store.mark_completed, job.job_guid)
+        else:
+            await asyncio.to_thread(self.store.mark_failed, job.job_guid, error)
+        return error
+
+    async def _claim_jobs(self) -> List[JobDetail]:
+        """API'den job'ları claim et (push modunda beklemesiz, aksi halde long-poll)"""
+        wait_seconds = 0 if self.api.events_connected else self.wait_seconds
+        # Sadece ilk claim (long-poll bekleyişi) stop() ile iptal edilebilir;
+        # devam claim'leri iptal edilirse sunucuda claim edilmiş job'lar kaybolur
+        self._claim_task = asyncio.ensure_future(
+            self.api.claim_next_job(wait_seconds=wait_seconds)
+        )
         try:
-            job = await self.api.claim_next_job()
-            return job
+            first = await self._claim_task
+        except asyncio.CancelledError:
+            if self._running:
+                raise
+            return []  # stop() sırasında iptal edildi
+        except ApiConnectionError:
+            raise
         except ApiError as e:
             if "No pending jobs" not in e.message:
                 logger.error(f"Failed to claim job: {e.message}")
-            return None
+            return []  # bekleme run() içindeki idle backoff'ta
+        finally:
+            self._claim_task = None
 
-    def _render_job(self, job: JobDetail) -> Optional[bytes]:
-        """Job'ı ESC/POS bytes'a çevir"""
+        if first is None:
+            return []
+        return [first] + await self.api.claim_more_jobs(self.max_batch - 1)
+
+    def _render_job(self, job: JobDetail) -> Optional[List[bytes]]:
+        """Job'ı ESC/POS parçalarına çevir (yazıcı thread'inde birleştirilip tek write ile gider)"""
         try:
-            result = self.renderer.render(
+            result = self.renderer.render_parts(
                 template_json=job.template_content,
                 data_json=job.print_data
             )
-            logger.debug(f"Rendered {len(result)} bytes for job {job.job_guid}")
+            logger.debug(f"Rendered {sum(map(len, result))} bytes for job {job.job_guid}")
             return result
         except Exception as e:
             logger.error(f"Render error for job {job.job_guid}: {e}")
             return None
 
-    async def _complete_job(self, job_guid: str) -> None:
-        """Job'ı başarılı olarak işaretle"""
-        # SQLite'a kaydet
-        self.store.mark_completed(job_guid)
-
-        # API'ye bildir
-        success = await self.api.complete_job(job_guid)
-        if success:
-            logger.info(f"Job completed: {job_guid}")
-        else:
-            logger.warning(f"Job printed but API notification failed: {job_guid}")
+    async def _mark_failed(self, job_guid: str, error: str) -> None:
+        """Beklenmeyen hatadan sonra job'ı SQLite'a failed olarak kaydet (best effort)"""
+        try:
+            await asyncio.to_thread(self.store.mark_failed, job_guid, error)
+        except Exception as e:
+            logger.error(f"Failed to record job failure locally: {job_guid} - {e}")
 
-    async def _fail_job(self, job_guid: str, error: str) -> None:
-        """Job'ı başarısız olarak işaretle"""
-        # SQLite'a kaydet
-        self.store.mark_failed(job_guid, error)
+    async def _report_results(self, completed: List[str], failed: List[Tuple[str, str]]) -> None:
+        """Batch sonuçlarını API'ye bildir (complete ve fail için birer bulk istek)"""
+        if completed:
+            try:
+                results = await self.api.complete_jobs(completed)
+            except ApiError as e:
+                logger.error(f"Failed to report completed jobs: {e.message}")
+                results = {}
+            for job_guid in completed:
+                if results.get(job_guid):
+                    logger.info(f"Job completed: {job_guid}")
+                else:
+                    logger.warning(f"Job printed but API notification failed: {job_guid}")
 
-        # API'ye bildir
-        try:
-            response = await self.api.fail_job(job_guid, error)
-            if response.will_retry:
-                logger.warning(f"Job failed (will retry): {job_guid} - {error}")
-            else:
-                logger.error(f"Job failed permanently: {job_guid} - {error}")
-        except ApiError as e:
-            logger.error(f"Failed to report job failure: {e.message}")
+        if failed:
+            try:
+                responses = await self.api.fail_jobs(failed)
+            except ApiError as e:
+                logger.error(f"Failed to report job failure: {e.message}")
+                return
+            for job_guid, error in failed:
+                if responses[job_guid].will_retry:
+                    logger.warning(f"Job failed (will retry): {job_guid} - {error}")
+                else:
+                    logger.error(f"Job failed permanently: {job_guid} - {error}")
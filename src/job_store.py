@@ -5,13 +5,48 @@ Duplicate job işlemeyi önler
 
 import sqlite3
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, List, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# SD kartta fsync pahalı: WAL + synchronous=NORMAL commit başına fsync'i kaldırır
+# (checkpoint'te yapılır; elektrik kesintisinde en fazla son commit'ler kaybolur)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # KiB; üst sınır, DB küçük olduğu sürece dolmaz
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# PRAGMA user_version - şema değiştikçe artar
+# 1: processed_at TEXT (ISO) → INTEGER (unix epoch saniye)
+SCHEMA_VERSION = 1
+
+# mark_* kayıtları bellekte biriktirilip tek transaction'da yazılır (commit başına WAL flush yok)
+MARK_FLUSH_SIZE = 16  # bu kadar kayıt birikince hemen yaz
+MARK_FLUSH_INTERVAL = 2.0  # seconds - JobProcessor'ın periyodik flush aralığı
+
+# SQL metinleri sabit - aynı string connection'ın statement cache'inden gelir
+# UPSERT (SQLite 3.24+): DELETE+INSERT yok, ilk processed_at korunur (cleanup ona göre)
+SQL_MARK = """
+    INSERT INTO processed_jobs (job_guid, processed_at, status, error)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(job_guid) DO UPDATE SET
+        status = excluded.status,
+        error = excluded.error
+"""
+SQL_STATUS = "SELECT status FROM processed_jobs WHERE job_guid = ?"
+SQL_ALL_GUIDS = "SELECT job_guid FROM processed_jobs"
+SQL_CLEANUP = "DELETE FROM processed_jobs WHERE processed_at < ?"
+SQL_STATS = "SELECT status, COUNT(*) FROM processed_jobs GROUP BY status"
+
 
 class JobStore:
     """SQLite tabanlı job tracking"""
@@ -23,127 +58,193 @@ class JobStore:
 
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Store ömrü boyunca tek yazıcı bağlantı (her çağrıda db/-wal/-shm açılıp kapanmasın)
+        # isolation_level=None: autocommit - her execute kendi transaction'ı
+        self._writer = sqlite3.connect(
+            str(self.db_path),
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=128
+        )
+        # mark_* asyncio.to_thread ile worker thread'den çağrılır - bağlantı erişimi tek tek
+        self._lock = threading.Lock()
+        # Yazılmayı bekleyen (job_guid, processed_at, status, error) satırları
+        self._pending: List[Tuple[str, int, str, Optional[str]]] = []
+        self._pending_lock = threading.Lock()
         self._init_db()
+        # WAL: okuyucu yazıcıyı beklemez - sorgular ayrı read-only bağlantıdan
+        self._reader = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=128
+        )
+        self._reader.execute("PRAGMA query_only=1")
+        self._read_lock = threading.Lock()
+        # İşlenmiş job_guid'ler bellekte - is_processed SQLite'a inmesin
+        self._seen: Set[str] = self._load_seen()
+
+    def _load_seen(self) -> Set[str]:
+        """Kayıtlı tüm job_guid'leri oku (7 günlük pencere, birkaç bin kayıt)"""
+        with self._read_lock:
+            cursor = self._reader.execute(SQL_ALL_GUIDS)
+            return {row[0] for row in cursor}
 
     def _init_db(self) -> None:
-        """Veritabanı tablolarını oluştur"""
-        with self._get_connection() as conn:
+        """PRAGMA'ları uygula ve veritabanı tablolarını oluştur"""
+        for pragma in PRAGMAS:
+            self._writer.execute(pragma)
+
+        version = self._writer.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1 and self._table_exists("processed_jobs"):
+            self._migrate_epoch_timestamps()
+
+        self._writer.execute("""
+            CREATE TABLE IF NOT EXISTS processed_jobs (
+                job_guid TEXT PRIMARY KEY,
+                processed_at INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT
+            )
+        """)
+        # Index for cleanup queries
+        self._writer.execute("""
+            CREATE INDEX IF NOT EXISTS idx_processed_at
+            ON processed_jobs(processed_at)
+        """)
+        self._writer.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _table_exists(self, name: str) -> bool:
+        cursor = self._writer.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (name,)
+        )
+        return cursor.fetchone() is not None
+
+    def _migrate_epoch_timestamps(self) -> None:
+        """
+        Eski şema: ISO TEXT processed_at'i INTEGER epoch'a çevir
+        Zaten INTEGER olan satırlar olduğu gibi kopyalanır (yarım kalmış migration).
+        """
+        with self._transaction() as conn:
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS processed_jobs (
+                CREATE TABLE processed_jobs_new (
                     job_guid TEXT PRIMARY KEY,
-                    processed_at TEXT NOT NULL,
+                    processed_at INTEGER NOT NULL,
                     status TEXT NOT NULL,
                     error TEXT
                 )
             """)
-            # Index for cleanup queries
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_processed_at
-                ON processed_jobs(processed_at)
+                INSERT INTO processed_jobs_new (job_guid, processed_at, status, error)
+                SELECT job_guid,
+                       CASE WHEN typeof(processed_at) = 'integer' THEN processed_at
+                            ELSE CAST(strftime('%s', processed_at) AS INTEGER) END,
+                       status, error
+                FROM processed_jobs
             """)
-            conn.commit()
+            conn.execute("DROP TABLE processed_jobs")
+            conn.execute("ALTER TABLE processed_jobs_new RENAME TO processed_jobs")
+            # Sürüm aynı transaction'da - commit sonrası çökme tekrar migrate ettirmez
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        logger.info("Migrated job store timestamps to epoch seconds")
 
     @contextmanager
-    def _get_connection(self):
-        """SQLite connection context manager"""
-        conn = sqlite3.connect(str(self.db_path))
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def _transaction(self):
+        """
+        Yazma transaction'ı - BEGIN IMMEDIATE ile write lock baştan alınır,
+        okuma→yazma kilit yükseltmesinde SQLITE_BUSY oluşmaz
+        """
+        with self._lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+
+    def close(self) -> None:
+        """Bekleyen kayıtları yaz ve veritabanı bağlantısını kapat"""
+        self.flush()
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._writer.close()
 
     def is_processed(self, job_guid: str) -> bool:
         """Job daha önce işlendi mi?"""
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM processed_jobs WHERE job_guid = ?",
-                (job_guid,)
-            )
-            return cursor.fetchone() is not None
+        return job_guid in self._seen
 
     def get_status(self, job_guid: str) -> Optional[str]:
         """Job'ın durumunu getir"""
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT status FROM processed_jobs WHERE job_guid = ?",
-                (job_guid,)
-            )
+        self.flush()
+        with self._read_lock:
+            cursor = self._reader.execute(SQL_STATUS, (job_guid,))
             row = cursor.fetchone()
-            return row[0] if row else None
+        return row[0] if row else None
+
+    def _mark(self, job_guid: str, status: str, error: Optional[str]) -> None:
+        """Job sonucunu kuyruğa ekle (MARK_FLUSH_SIZE dolunca hemen yazılır)"""
+        with self._pending_lock:
+            self._pending.append((job_guid, int(time.time()), status, error))
+            full = len(self._pending) >= MARK_FLUSH_SIZE
+        self._seen.add(job_guid)
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Bekleyen mark_* kayıtlarını tek transaction'da yaz, yazılan satır sayısını döndür"""
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            try:
+                with self._transaction() as conn:
+                    conn.executemany(SQL_MARK, rows)
+            except sqlite3.Error:
+                # Yazılamadı - kayıtları kaybetme, sonraki flush'ta tekrar dene
+                with self._pending_lock:
+                    self._pending[:0] = rows
+                raise
+        return len(rows)
 
     def mark_completed(self, job_guid: str) -> None:
         """Job'ı tamamlandı olarak işaretle"""
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO processed_jobs
-                (job_guid, processed_at, status, error)
-                VALUES (?, ?, ?, ?)
-                """,
-                (job_guid, datetime.utcnow().isoformat(), "completed", None)
-            )
-            conn.commit()
+        self._mark(job_guid, "completed", None)
         logger.debug(f"Job marked as completed: {job_guid}")
 
     def mark_failed(self, job_guid: str, error: str) -> None:
         """Job'ı başarısız olarak işaretle"""
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO processed_jobs
-                (job_guid, processed_at, status, error)
-                VALUES (?, ?, ?, ?)
-                """,
-                (job_guid, datetime.utcnow().isoformat(), "failed", error)
-            )
-            conn.commit()
+        self._mark(job_guid, "failed", error)
         logger.debug(f"Job marked as failed: {job_guid} - {error}")
 
     def mark_skipped(self, job_guid: str, reason: str) -> None:
         """Job'ı atlandı olarak işaretle"""
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO processed_jobs
-                (job_guid, processed_at, status, error)
-                VALUES (?, ?, ?, ?)
-                """,
-                (job_guid, datetime.utcnow().isoformat(), "skipped", reason)
-            )
-            conn.commit()
+        self._mark(job_guid, "skipped", reason)
         logger.debug(f"Job marked as skipped: {job_guid} - {reason}")
 
     def cleanup_old(self, days: int = 7) -> int:
         """Eski kayıtları temizle"""
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        cutoff_str = cutoff.isoformat()
+        cutoff = int(time.time()) - days * 86400
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "DELETE FROM processed_jobs WHERE processed_at < ?",
-                (cutoff_str,)
-            )
-            conn.commit()
-            deleted = cursor.rowcount
+        self.flush()
+        with self._transaction() as conn:
+            cursor = conn.execute(SQL_CLEANUP, (cutoff,))
+        deleted = cursor.rowcount
 
         if deleted > 0:
+            self._seen = self._load_seen()
             logger.info(f"Cleaned up {deleted} old job records")
 
         return deleted
 
     def get_stats(self) -> dict:
         """İstatistikleri getir"""
-        with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT
-                    status,
-                    COUNT(*) as count
-                FROM processed_jobs
-                GROUP BY status
-            """)
-            stats = {row[0]: row[1] for row in cursor.fetchall()}
+        self.flush()
+        with self._read_lock:
+            cursor = self._reader.execute(SQL_STATS)
+            stats = {row[0]: row[1] for row in cursor}
 
-            cursor = conn.execute("SELECT COUNT(*) FROM processed_jobs")
-            stats["total"] = cursor.fetchone()[0]
+        stats["total"] = sum(stats.values())
 
         return stats
@@ -9,6 +9,8 @@ Author: Feedemy Team
 
 import asyncio
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
 import os
@@ -19,12 +21,20 @@ __version__ = "1.0.0"
 
 from .config_manager import ConfigManager
 from .auto_updater import AutoUpdater
-from .api_client import FeedemyApiClient, ApiError
+from .api_client import FeedemyApiClient, ApiError, close_shared_connector
 from .printer_manager import PrinterManager
 from .template_renderer import TemplateRenderer
 from .job_store import JobStore
+from .template_cache import TemplateCache
 from .job_processor import JobProcessor
 
+# uvloop opsiyonel - yoksa standart asyncio event loop kullanılır
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Logging setup
 log_dir = Path(__file__).parent.parent / "logs"
 log_dir.mkdir(exist_ok=True)
@@ -32,14 +42,23 @@ log_dir.mkdir(exist_ok=True)
 # Log level from environment variable
 log_level = os.environ.get("FEEDEMY_LOG_LEVEL", "INFO").upper()
 
+# Log yazımı arka plan thread'inde (QueueListener) - SD kart yavaşlığı event loop'u bloklamasın
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(log_formatter)
+file_handler = logging.FileHandler(log_dir / 'feedemy-printer.log', mode='a', encoding='utf-8')
+file_handler.setFormatter(log_formatter)
+
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue, stream_handler, file_handler, respect_handler_level=True
+)
+
 logging.basicConfig(
     level=getattr(logging, log_level, logging.INFO),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(log_dir / 'feedemy-printer.log', mode='a', encoding='utf-8')
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
 
 # Reduce noise from aiohttp and other libraries
 logging.getLogger("aiohttp").setLevel(logging.WARNING)
@@ -53,9 +72,11 @@ class FeedemyPrinterApp:
 
     def __init__(self):
         self.config = ConfigManager()
+        self.template_cache = TemplateCache()
         self.api: FeedemyApiClient = None
         self.printer_manager: PrinterManager = None
         self.job_processor: JobProcessor = None
+        self.store: JobStore = None
         self._shutdown_event = asyncio.Event()
 
     async def run(self) -> None:
@@ -72,9 +93,12 @@ class FeedemyPrinterApp:
                 self._check_updates()
 
             # 2. API client oluştur
+            template_cache, template_etag = self.template_cache.load()
             self.api = FeedemyApiClient(
                 base_url=self.config.api.base_url,
-                token=self.config.api.token
+                token=self.config.api.token,
+                template_cache=template_cache,
+                template_etag=template_etag
             )
 
             # 3. Register kontrolü
@@ -97,17 +121,19 @@ class FeedemyPrinterApp:
             await self._register_new_printers()
 
             # 5. Job processor başlat
-            store = JobStore()
+            self.store = JobStore()
             renderer = TemplateRenderer(
                 default_width=self.config.printer.default_width
             )
 
             self.job_processor = JobProcessor(
                 api=self.api,
-                store=store,
+                store=self.store,
                 renderer=renderer,
                 printer_manager=self.printer_manager,
-                poll_interval=self.config.polling.interval_seconds
+                poll_interval=self.config.polling.interval_seconds,
+                wait_seconds=self.config.polling.wait_seconds,
+                max_batch=self.config.polling.batch_size
             )
 
             # Signal handlers
@@ -201,7 +227,7 @@ class FeedemyPrinterApp:
 
         for printer in printers:
             # Zaten kayıtlıysa atla
-            if self.config.is_printer_registered(printer.device_address):
+            if self.config.is_printer_registered(printer.device_address, printer.signature):
                 logger.debug(f"Printer already registered: {printer.device_address}")
                 continue
 
@@ -216,7 +242,8 @@ class FeedemyPrinterApp:
                 # Kayıtlı listesine ekle
                 self.config.add_registered_printer(
                     device_address=printer.device_address,
-                    printer_guid=result.branch_printer_guid
+                    printer_guid=result.branch_printer_guid,
+                    signature=printer.signature
                 )
                 logger.info(f"Printer registered: {result.branch_printer_guid}")
             except ApiError as e:
@@ -244,18 +271,36 @@ class FeedemyPrinterApp:
         logger.info("Shutting down...")
 
         if self.printer_manager:
-            self.printer_manager.stop()
+            await self.printer_manager.stop()
 
         if self.api:
             await self.api.close()
+            if self.api.template_cache_dirty:
+                try:
+                    self.template_cache.save(
+                        self.api.template_cache,
+                        self.api.template_etag
+                    )
+                except OSError as e:
+                    # Cache kaybı sadece yeniden indirme demek - shutdown devam etsin
+                    logger.warning(f"Failed to save template cache: {e}")
+        await close_shared_connector()
+
+        if self.store:
+            self.store.close()
 
         logger.info("Shutdown complete")
 
 
 def main():
     """Entry point"""
+    if UVLOOP_AVAILABLE:
+        uvloop.install()  # asyncio.run() öncesi - loop policy'yi değiştirir
     app = FeedemyPrinterApp()
-    asyncio.run(app.run())
+    try:
+        asyncio.run(app.run())
+    finally:
+        log_listener.stop()  # kuyrukta kalan kayıtları yaz
 
 
 if __name__ == "__main__":
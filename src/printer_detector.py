@@ -3,10 +3,11 @@ Printer Detector - pyudev ile USB yazıcı tespiti
 Linux'ta USB hotplug olaylarını dinler
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass
-from typing import Callable, List, Optional
-import threading
+import os
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,36 @@ KNOWN_PRINTER_MODELS = {
     ("28e9", "0289"): ("Generic", "POS-58"),
 }
 
+# Class/vendor eşleşmezse ürün adında aranan anahtar kelimeler (son çare)
+PRINTER_KEYWORDS = ("printer", "pos", "receipt", "thermal")
+
+USB_LP_DIR = "/dev/usb"  # usblp device node'ları (lp0, lp1, ...)
+
+# (vid << 16) | pid → (vendor, model); int key hash'i string tuple'dan ucuz
+_MODEL_LUT = {
+    (int(vid, 16) << 16) | int(pid, 16): model
+    for (vid, pid), model in KNOWN_PRINTER_MODELS.items()
+}
+
+
+def _hex_id(value: str) -> int:
+    """udev hex ID'si → int (boş/geçersiz ise -1, hiçbir key ile eşleşmez)"""
+    try:
+        return int(value, 16)
+    except ValueError:
+        return -1
+
+
+# Model bilinmiyorsa vendor ID'den üretici tahmini
+VENDOR_NAMES = {
+    "04b8": "Epson",
+    "0416": "WinPOS",
+    "0483": "Xprinter",
+    "0fe6": "Rongta",
+    "1504": "Goojprt",
+    "28e9": "Generic POS",
+}
+
 
 @dataclass
 class USBPrinter:
@@ -50,40 +81,53 @@ class USBPrinter:
     manufacturer: Optional[str]
     product: Optional[str]
     serial: Optional[str]
+    vendor_id_int: int = field(default=-1, init=False, repr=False, compare=False)
+    product_id_int: int = field(default=-1, init=False, repr=False, compare=False)
+    # KNOWN_PRINTER_MODELS sonucu - oluşturulurken bir kez çözülür
+    _known_model: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        # udev ID'leri normalize et - lookup'lar her erişimde lower() yapmasın
+        self.vendor_id = self.vendor_id.lower()
+        self.product_id = self.product_id.lower()
+        self.vendor_id_int = _hex_id(self.vendor_id)
+        self.product_id_int = _hex_id(self.product_id)
+        if self.vendor_id_int >= 0 and self.product_id_int >= 0:
+            self._known_model = _MODEL_LUT.get((self.vendor_id_int << 16) | self.product_id_int)
 
     @property
     def device_address(self) -> str:
         """API'ye gönderilecek device address"""
         return self.device_path
 
+    @property
+    def signature(self) -> str:
+        """
+        Kalıcı yazıcı kimliği (vendor:product:serial)
+        device_path yeniden takınca değişebilir; serial yoksa path'e düşer
+        """
+        return f"{self.vendor_id}:{self.product_id}:{self.serial or self.device_path}"
+
     @property
     def vendor_name(self) -> str:
         """Yazıcı üreticisi"""
         # Önce lookup table'dan bak
-        key = (self.vendor_id.lower(), self.product_id.lower())
-        if key in KNOWN_PRINTER_MODELS:
-            return KNOWN_PRINTER_MODELS[key][0]
+        if self._known_model:
+            return self._known_model[0]
         # Manufacturer string varsa kullan
         if self.manufacturer:
             return self.manufacturer
         # Vendor ID'den tahmin et
-        vendor_map = {
-            "04b8": "Epson",
-            "0416": "WinPOS",
-            "0483": "Xprinter",
-            "0fe6": "Rongta",
-            "1504": "Goojprt",
-            "28e9": "Generic POS",
-        }
-        return vendor_map.get(self.vendor_id.lower(), "Unknown")
+        return VENDOR_NAMES.get(self.vendor_id, "Unknown")
 
     @property
     def printer_model(self) -> str:
         """Yazıcı model adı"""
         # Önce lookup table'dan bak
-        key = (self.vendor_id.lower(), self.product_id.lower())
-        if key in KNOWN_PRINTER_MODELS:
-            vendor, model = KNOWN_PRINTER_MODELS[key]
+        if self._known_model:
+            vendor, model = self._known_model
             return f"{vendor} {model}"
 
         # Product string varsa ve anlamlıysa kullan
@@ -113,6 +157,8 @@ class USBPrinterDetector:
         "28e9": "Printer vendor",
         "4348": "WCH (CH340)",
     }
+    # Üyelik kontrolü için (anahtarlar küçük harf)
+    _KNOWN_VENDOR_SET = frozenset(KNOWN_PRINTER_VENDORS)
 
     def __init__(
         self,
@@ -121,8 +167,9 @@ class USBPrinterDetector:
     ):
         self.on_printer_added = on_printer_added
         self.on_printer_removed = on_printer_removed
-        self._monitor_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        # Hotplug monitor event loop'a fd reader olarak bağlanır (ayrı thread yok)
+        self._monitor = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         if PYUDEV_AVAILABLE:
             self._context = pyudev.Context()
@@ -136,43 +183,38 @@ class USBPrinterDetector:
             return []
 
         printers = []
+        seen_paths = set()
 
-        # USB printer class devices
-        for device in self._context.list_devices(subsystem='usb', DEVTYPE='usb_device'):
-            if self._is_printer(device):
-                printer = self._device_to_printer(device)
-                if printer:
-                    printers.append(printer)
-
-        # usblp subsystem (printer specific)
+        # usblp subsystem (printer specific) - genelde birkaç node, önce bunlar
         for device in self._context.list_devices(subsystem='usblp'):
             printer = self._usblp_to_printer(device)
-            if printer:
-                # Duplicate check
-                if not any(p.device_path == printer.device_path for p in printers):
-                    printers.append(printer)
+            if printer and printer.device_path not in seen_paths:
+                seen_paths.add(printer.device_path)
+                printers.append(printer)
+
+        # USB printer class devices - tüm USB cihazlarını dolaşır, sadece
+        # usblp'ye henüz bağlanmamış yazıcılar için fallback
+        if not printers:
+            for device in self._context.list_devices(subsystem='usb', DEVTYPE='usb_device'):
+                if self._is_printer(device):
+                    printer = self._device_to_printer(device)
+                    if printer and printer.device_path not in seen_paths:
+                        seen_paths.add(printer.device_path)
+                        printers.append(printer)
 
         logger.info(f"Found {len(printers)} USB printer(s)")
         return printers
 
     def _is_printer(self, device) -> bool:
         """Device yazıcı mı kontrol et"""
-        # USB class 7 = Printer
-        bInterfaceClass = device.get("bInterfaceClass")
-        if bInterfaceClass == "07":
-            return True
-
-        # Vendor ID check
-        vendor_id = device.get("ID_VENDOR_ID", "").lower()
-        if vendor_id in self.KNOWN_PRINTER_VENDORS:
+        # USB class 7 = Printer / Vendor ID check
+        if (device.get("bInterfaceClass") == "07"
+                or (device.get("ID_VENDOR_ID") or "").lower() in self._KNOWN_VENDOR_SET):
             return True
 
         # Product string check
-        product = device.get("ID_MODEL", "").lower()
-        if any(kw in product for kw in ["printer", "pos", "receipt", "thermal"]):
-            return True
-
-        return False
+        product = (device.get("ID_MODEL") or "").lower()
+        return any(kw in product for kw in PRINTER_KEYWORDS)
 
     def _device_to_printer(self, device) -> Optional[USBPrinter]:
         """pyudev device → USBPrinter"""
@@ -189,10 +231,7 @@ class USBPrinterDetector:
 
             if not device_path:
                 # Fallback: /dev/usb/lpX ara
-                import glob
-                lp_devices = glob.glob("/dev/usb/lp*")
-                if lp_devices:
-                    device_path = lp_devices[0]
+                device_path = self._find_lp_device()
 
             if not device_path:
                 return None
@@ -209,6 +248,17 @@ class USBPrinterDetector:
             logger.error(f"Error parsing device: {e}")
             return None
 
+    @staticmethod
+    def _find_lp_device() -> Optional[str]:
+        """/dev/usb altındaki ilk lp* device node'u"""
+        if not os.path.isdir(USB_LP_DIR):
+            return None
+        with os.scandir(USB_LP_DIR) as entries:
+            return next(
+                (f"{USB_LP_DIR}/{e.name}" for e in entries if e.name.startswith("lp")),
+                None
+            )
+
     def _usblp_to_printer(self, device) -> Optional[USBPrinter]:
         """usblp device → USBPrinter"""
         try:
@@ -216,16 +266,13 @@ class USBPrinterDetector:
             if not device_path:
                 return None
 
-            parent = device.parent
-            while parent:
-                vendor_id = parent.get("ID_VENDOR_ID")
-                if vendor_id:
-                    break
-                parent = parent.parent
+            # USB device (vendor/model bilgisi burada) - zincir libudev'de dolaşılır
+            parent = device.find_parent(subsystem='usb', device_type='usb_device')
+            vendor_id = parent.get("ID_VENDOR_ID", "") if parent else ""
 
             return USBPrinter(
                 device_path=device_path,
-                vendor_id=parent.get("ID_VENDOR_ID", "") if parent else "",
+                vendor_id=vendor_id,
                 product_id=parent.get("ID_MODEL_ID", "") if parent else "",
                 manufacturer=parent.get("ID_VENDOR") if parent else None,
                 product=parent.get("ID_MODEL") if parent else None,
@@ -235,49 +282,67 @@ class USBPrinterDetector:
             logger.error(f"Error parsing usblp device: {e}")
             return None
 
-    def start_monitoring(self) -> None:
-        """Hotplug monitoring başlat"""
+    def start_monitoring_async(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Hotplug monitoring başlat - udev netlink fd'si loop'ta dinlenir"""
         if not PYUDEV_AVAILABLE:
             logger.warning("pyudev not available - monitoring disabled")
             return
 
-        if self._monitor_thread and self._monitor_thread.is_alive():
+        if self._monitor is not None:
             logger.warning("Monitoring already running")
             return
 
-        self._stop_event.clear()
-        self._monitor_thread = threading.Thread(
-            target=self._monitor_loop,
-            daemon=True,
-            name="USBPrinterMonitor"
-        )
-        self._monitor_thread.start()
+        monitor = pyudev.Monitor.from_netlink(self._context)
+        monitor.filter_by(subsystem='usblp')
+        monitor.start()
+        loop.add_reader(monitor.fileno(), self._on_udev_readable)
+        self._monitor = monitor
+        self._loop = loop
         logger.info("USB printer monitoring started")
 
     def stop_monitoring(self) -> None:
         """Hotplug monitoring durdur"""
-        self._stop_event.set()
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=2.0)
+        monitor, loop = self._monitor, self._loop
+        self._monitor = None
+        self._loop = None
+        if monitor is not None:
+            try:
+                loop.remove_reader(monitor.fileno())
+            except (RuntimeError, ValueError) as e:
+                # Loop kapanmış olabilir - monitor yine de serbest bırakılır
+                logger.debug(f"udev reader already removed: {e}")
+            # pyudev.Monitor'ın close'u yok; son referans bırakılınca
+            # udev_monitor_unref netlink socket'ini kapatır
+            del monitor
         logger.info("USB printer monitoring stopped")
 
-    def _monitor_loop(self) -> None:
-        """Hotplug event loop"""
-        monitor = pyudev.Monitor.from_netlink(self._context)
-        monitor.filter_by(subsystem='usblp')
+    def _on_udev_readable(self) -> None:
+        """Netlink fd okunabilir - bekleyen tüm hotplug olaylarını işle"""
+        monitor = self._monitor
+        if monitor is None:
+            return
+        while True:
+            try:
+                device = monitor.poll(timeout=0)
+            except OSError as e:
+                # ENOBUFS vb. (hotplug fırtınasında netlink buffer taşması) -
+                # olay kaybolabilir ama dinlemeye devam edilir
+                logger.warning(f"udev monitor read error: {e}")
+                return
+            if device is None:
+                return
+            self._handle_event(device)
+
+    def _handle_event(self, device) -> None:
+        """Tek hotplug olayı"""
+        if device.action == 'add':
+            printer = self._usblp_to_printer(device)
+            if printer and self.on_printer_added:
+                logger.info(f"USB printer added: {printer.device_path}")
+                self.on_printer_added(printer)
 
-        for device in iter(monitor.poll, None):
-            if self._stop_event.is_set():
-                break
-
-            if device.action == 'add':
-                printer = self._usblp_to_printer(device)
-                if printer and self.on_printer_added:
-                    logger.info(f"USB printer added: {printer.device_path}")
-                    self.on_printer_added(printer)
-
-            elif device.action == 'remove':
-                device_path = device.device_node
-                if device_path and self.on_printer_removed:
-                    logger.info(f"USB printer removed: {device_path}")
-                    self.on_printer_removed(device_path)
+        elif device.action == 'remove':
+            device_path = device.device_node
+            if device_path and self.on_printer_removed:
+                logger.info(f"USB printer removed: {device_path}")
+                self.on_printer_removed(device_path)
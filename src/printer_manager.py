@@ -2,14 +2,61 @@
 Printer Manager - USB yazıcıya veri gönderme
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from .printer_detector import USBPrinter, USBPrinterDetector
 
 logger = logging.getLogger(__name__)
 
+# Buffer'sız yazma - her çağrı doğrudan write(2)
+DEVICE_OPEN_FLAGS = os.O_WRONLY | getattr(os, "O_CLOEXEC", 0)
+# usblp'de her write(2) ayrı USB transfer'i - stream parçaları en az bu kadar birikir
+WRITE_BUFFER_SIZE = 4096
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Kısmi write'larda kalan kısmı memoryview dilimiyle (kopyasız) tekrar yaz"""
+    with memoryview(data) as view:  # bytearray buffer'ı sonra clear() edilebilsin
+        offset = 0
+        while offset < len(view):
+            offset += os.write(fd, view[offset:])
+
+
+def _write_device(path: str, chunks: Iterable[bytes]) -> int:
+    """
+    Parçaları device node'a BufferedWriter kopyası olmadan yaz
+    Hazır liste/tuple birleştirilip tek write ile gönderilir (usblp write_iter
+    desteklemez, writev her parçayı ayrı transfer yapar). Generator parçaları
+    WRITE_BUFFER_SIZE dolunca yazılır.
+    EACCES/ENOENT, os.open'dan PermissionError/FileNotFoundError olarak gelir.
+    """
+    fd = os.open(path, DEVICE_OPEN_FLAGS)
+    try:
+        if isinstance(chunks, (list, tuple)):
+            data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            _write_all(fd, data)
+            return len(data)
+
+        written = 0
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                _write_all(fd, buffer)
+                written += len(buffer)
+                buffer.clear()
+        if buffer:
+            _write_all(fd, buffer)
+            written += len(buffer)
+        return written
+    finally:
+        os.close(fd)
+
 
 @dataclass
 class PrintResult:
@@ -29,9 +76,16 @@ class PrinterManager:
             on_printer_removed=self._on_printer_removed
         )
         self._default_printer: Optional[str] = None
+        # Tek yazıcı thread'i: fişler sırayla yazılır, render'larla aynı
+        # default executor'ı paylaşmaz
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="printer-writer")
 
-    def start(self) -> None:
-        """Başlangıçta yazıcıları tara ve monitoring başlat"""
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Başlangıçta yazıcıları tara ve monitoring başlat
+        Hotplug monitoring event loop gerektirir (verilen ya da çalışan loop);
+        loop yoksa (örn. CLI test-print) sadece tarama yapılır.
+        """
         # Mevcut yazıcıları tara
         printers = self._detector.get_connected_printers()
         for printer in printers:
@@ -39,12 +93,22 @@ class PrinterManager:
             if self._default_printer is None:
                 self._default_printer = printer.device_path
 
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logger.info("No running event loop - hotplug monitoring disabled")
+                return
+
         # Hotplug monitoring başlat
-        self._detector.start_monitoring()
+        self._detector.start_monitoring_async(loop)
 
-    def stop(self) -> None:
-        """Monitoring durdur"""
+    async def stop(self) -> None:
+        """Monitoring durdur ve yazıcı thread'ini kapat"""
         self._detector.stop_monitoring()
+        # Yazılmakta olan fiş yarıda kesilmesin - join event loop'u bloklamadan
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.shutdown, True)
 
     def _on_printer_added(self, printer: USBPrinter) -> None:
         """Yeni yazıcı eklendi callback"""
@@ -94,9 +158,52 @@ class PrinterManager:
         Returns:
             PrintResult
         """
-        # Yazıcı seç
+        return self.print_stream((data,), device_path)
+
+    def print_stream(self, chunks: Iterable[bytes], device_path: str = None) -> PrintResult:
+        """
+        Yazıcıya veriyi parça parça gönder
+        Generator (örn. TemplateRenderer.render_chunks): parçalar üretildikçe
+        WRITE_BUFFER_SIZE'lık bloklarla yazılır. Liste (örn. TemplateRenderer.render_parts): tek write.
+
+        Args:
+            chunks: ESC/POS byte parçaları
+            device_path: Hedef yazıcı (None = default)
+
+        Returns:
+            PrintResult
+        """
         target_path = device_path or self._default_printer
+        error = self._check_target(target_path)
+        if error:
+            return error
+
+        result, removed = self._write_target(target_path, chunks)
+        if removed:
+            self._on_printer_removed(target_path)
+        return result
 
+    async def print_parts_async(self, parts: List[bytes], device_path: str = None) -> PrintResult:
+        """
+        print_stream'i parça listesiyle yazıcı thread'inde çalıştır - sonuç hazır olunca döner
+        Yazıcı seçimi ve listeden kaldırma event loop thread'inde kalır
+        (_printers'ı hotplug callback'leri de loop thread'inde değiştirir).
+        """
+        target_path = device_path or self._default_printer
+        error = self._check_target(target_path)
+        if error:
+            return error
+
+        loop = asyncio.get_running_loop()
+        result, removed = await loop.run_in_executor(
+            self._writer, self._write_target, target_path, parts
+        )
+        if removed:
+            self._on_printer_removed(target_path)
+        return result
+
+    def _check_target(self, target_path: Optional[str]) -> Optional[PrintResult]:
+        """Hedef yazıcı kayıtlı değilse hata sonucu döndür"""
         if not target_path:
             return PrintResult(
                 success=False,
@@ -108,35 +215,38 @@ class PrinterManager:
                 success=False,
                 error=f"Printer not found: {target_path}"
             )
+        return None
+
+    def _write_target(self, target_path: str, chunks: Iterable[bytes]) -> Tuple[PrintResult, bool]:
+        """
+        Yazıcıya gönder - yazıcı thread'inde çalışabilir, paylaşılan state'e dokunmaz
 
-        # Yazıcıya gönder
+        Returns:
+            (PrintResult, True = device node yok, yazıcı listeden kaldırılmalı)
+        """
         try:
-            with open(target_path, 'wb') as printer:
-                bytes_written = printer.write(data)
-                printer.flush()
+            bytes_written = _write_device(target_path, chunks)
 
             logger.info(f"Printed {bytes_written} bytes to {target_path}")
             return PrintResult(
                 success=True,
                 bytes_written=bytes_written
-            )
+            ), False
 
         except PermissionError:
             error = f"Permission denied: {target_path}. Run: sudo chmod 666 {target_path}"
             logger.error(error)
-            return PrintResult(success=False, error=error)
+            return PrintResult(success=False, error=error), False
 
         except FileNotFoundError:
             error = f"Printer not found: {target_path}"
             logger.error(error)
-            # Yazıcı listesinden kaldır
-            self._on_printer_removed(target_path)
-            return PrintResult(success=False, error=error)
+            return PrintResult(success=False, error=error), True
 
         except Exception as e:
             error = f"Print error: {e}"
             logger.error(error)
-            return PrintResult(success=False, error=error)
+            return PrintResult(success=False, error=error), False
 
     def test_print(self, device_path: str = None) -> PrintResult:
         """Test yazdırma"""
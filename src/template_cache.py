@@ -0,0 +1,74 @@
+"""
+Template Cache - indirilen template'leri ayrı dosyada saklar
+config.json sadece ayarlar içindir; template gövdeleri ve ETag burada tutulur
+"""
+
+import json
+import os
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+
+# orjson opsiyonel - yoksa stdlib json kullanılır
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """(template_guid, version) → içerik cache'i ve son ETag (data/template_cache.json)"""
+
+    def __init__(self, cache_path: Optional[str] = None):
+        if cache_path is None:
+            # Job store ile aynı data dizini
+            project_root = Path(__file__).parent.parent
+            cache_path = project_root / "data" / "template_cache.json"
+
+        self.cache_path = Path(cache_path)
+
+    def load(self) -> Tuple[Dict[Tuple[str, int], str], Optional[str]]:
+        """Kayıtlı template cache'i ve son ETag'i getir (dosya yok/bozuksa boş)"""
+        if not self.cache_path.exists():
+            return {}, None
+
+        try:
+            raw = self.cache_path.read_bytes()
+            cache_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            templates = {
+                (t["guid"], t["version"]): t["content"]
+                for t in cache_data.get("templates", [])
+            }
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            # Cache sadece hızlandırır - okunamazsa template'ler yeniden indirilir
+            logger.warning(f"Template cache unreadable, ignoring: {e}")
+            return {}, None
+        return templates, cache_data.get("etag")
+
+    def save(self, templates: Dict[Tuple[str, int], str], etag: Optional[str]) -> None:
+        """
+        Template cache'i kaydet (restart sonrası tekrar indirilmesin)
+        Önce .tmp dosyasına yazıp os.replace ile atomik olarak değiştirir
+        """
+        cache_data = {
+            "etag": etag,
+            "templates": [
+                {"guid": guid, "version": version, "content": content}
+                for (guid, version), content in templates.items()
+            ]
+        }
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(cache_data)
+        else:
+            raw = json.dumps(cache_data, ensure_ascii=False).encode("utf-8")
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".json.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.cache_path)
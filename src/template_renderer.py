@@ -6,7 +6,9 @@ JSON template → ESC/POS bytes
 import json
 import re
 import logging
-from typing import Any
+from collections import OrderedDict
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Final, Iterator, List, Optional, Pattern, Tuple, Union
 
 import sys
 from pathlib import Path
@@ -23,12 +25,71 @@ from templates.escpos_commands import (
 
 logger = logging.getLogger(__name__)
 
+# orjson opsiyonel - yoksa stdlib json kullanılır
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# {{key}} / {{nested.key}} placeholder'ları
+_PLACEHOLDER_RE: Final[Pattern[str]] = re.compile(r'\{\{(\w+(?:\.\w+)*)\}\}')
+
+# Condition değeri tipine göre truthy kontrolü (JSON tipleri); diğer tipler → True
+_COND_TRUTHY: Final[Dict[type, Callable[[Any], bool]]] = {
+    bool: lambda v: v,
+    int: lambda v: v != 0,
+    float: lambda v: v != 0,
+    str: bool,
+    list: bool,
+}
+
+PLAN_CACHE_SIZE: Final = 32  # derlenmiş template planı (şube başına birkaç template)
+
+# Derlenmiş template adımı: (data, parts) → parts'a ESC/POS bytes ekler
+Step = Callable[[dict, List[bytes]], None]
+# Element derleme sonucu: siparişten bağımsızsa hazır bytes, değilse adım
+Compiled = Union[bytes, Step]
+
+
+def _constant_step(chunk: bytes) -> Step:
+    """Siparişten bağımsız element - bytes derlemede hazır"""
+    def step(data: dict, parts: List[bytes]) -> None:
+        parts.append(chunk)
+    return step
+
+
+def _json_loads(raw: str) -> Any:
+    """JSON decode (orjson varsa onunla) - orjson.JSONDecodeError da json.JSONDecodeError'dır"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """"order.items" → ("order", "items") - aynı key her placeholder'da tekrar bölünmez"""
+    return tuple(key.split("."))
+
+
+def _lookup(data: dict, keys: Tuple[str, ...]) -> Any:
+    """Önceden bölünmüş key ile nested erişim - eksik key / dict olmayan ara değer → None"""
+    try:
+        value = data
+        for k in keys:
+            value = value[k]
+        return value
+    except (KeyError, TypeError):
+        return None
+
 
 class TemplateRenderer:
     """JSON template'i ESC/POS byte'larına çevirir"""
 
-    def __init__(self, default_width: int = 48):
-        self.default_width = default_width
+    def __init__(self, default_width: int = 48) -> None:
+        self.default_width: int = default_width
+        # template_json → derlenmiş plan
+        self._plan_cache: "OrderedDict[str, List[Step]]" = OrderedDict()
 
     def render(self, template_json: str, data_json: str) -> bytes:
         """
@@ -42,180 +103,294 @@ class TemplateRenderer:
             ESC/POS byte sequence
         """
         try:
-            template = json.loads(template_json)
-            data = json.loads(data_json)
+            render_data = self.compile(template_json)
+            data = _json_loads(data_json)
         except json.JSONDecodeError as e:
             logger.error(f"JSON parse error: {e}")
             return self._render_error("JSON Parse Error")
 
-        width = template.get("width", self.default_width)
-        elements = template.get("elements", [])
+        return render_data(data)
 
-        # Printer'ı initialize et
-        output = bytearray()
-        output.extend(INIT)
-        output.extend(SELECT_CHARSET)
-
-        # Her elementi render et
-        for element in elements:
-            # Conditional check
-            cond = element.get("cond")
-            if cond and not self._check_condition(cond, data):
-                continue
-
-            elem_type = element.get("t", "text")
-            rendered = self._render_element(elem_type, element, data, width)
-            output.extend(rendered)
-
-        return bytes(output)
+    def compile(self, template_json: str) -> Callable[[dict], bytes]:
+        """
+        Template'i sipariş verisi → ESC/POS bytes fonksiyonuna çevir
+        Plan compile_template cache'inden gelir; fonksiyon sadece adımları çalıştırır.
+        """
+        return partial(self._run_plan, self.compile_template(template_json))
 
-    def _check_condition(self, cond: str, data: dict) -> bool:
+    def render_parts(self, template_json: str, data_json: str) -> List[bytes]:
         """
-        Condition kontrolü
-        cond = "fieldName" → data'da fieldName varsa ve truthy ise True
+        render() ile aynı çıktı, birleştirilmemiş parça listesi olarak
+        Birleştirme render thread'inde değil, PrinterManager yazıcı thread'inde yapılır.
         """
-        value = self._get_nested_value(data, cond)
-        if value is None:
-            return False
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, (int, float)):
-            return value != 0
-        if isinstance(value, str):
-            return len(value) > 0
-        if isinstance(value, list):
-            return len(value) > 0
-        return True
+        try:
+            plan = self.compile_template(template_json)
+            data = _json_loads(data_json)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse error: {e}")
+            return [self._render_error("JSON Parse Error")]
 
-    def _get_nested_value(self, data: dict, key: str) -> Any:
+        return self._run_plan_parts(plan, data)
+
+    def render_chunks(self, template_json: str, data_json: str) -> Iterator[bytes]:
         """
-        Nested key erişimi: "order.items" → data["order"]["items"]
+        render() ile aynı çıktı, plan adımı başına bir parça olarak
+        Parçalar PrinterManager.print_stream ile üretildikçe yazılabilir.
         """
-        keys = key.split(".")
-        value = data
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return None
-        return value
+        try:
+            plan = self.compile_template(template_json)
+            data = _json_loads(data_json)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse error: {e}")
+            yield self._render_error("JSON Parse Error")
+            return
+
+        for step in plan:
+            parts: List[bytes] = []
+            step(data, parts)
+            if parts:
+                yield b"".join(parts)
+
+    def render_compiled(self, plan: List[Step], data_json: str) -> bytes:
+        """Önceden derlenmiş plan ile render (compile_template çıktısı)"""
+        try:
+            data = _json_loads(data_json)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse error: {e}")
+            return self._render_error("JSON Parse Error")
+
+        return self._run_plan(plan, data)
+
+    def _run_plan(self, plan: List[Step], data: dict) -> bytes:
+        """Plan adımlarını sipariş verisiyle çalıştır"""
+        return b"".join(self._run_plan_parts(plan, data))
+
+    def _run_plan_parts(self, plan: List[Step], data: dict) -> List[bytes]:
+        """Plan adımlarını çalıştır - birleştirilmemiş parçalar (INIT planın ilk parçası)"""
+        parts: List[bytes] = []
+        for step in plan:
+            step(data, parts)
 
-    def _replace_placeholders(self, text: str, data: dict) -> str:
+        return parts
+
+    # === Template Compilation ===
+
+    def compile_template(self, template_json: str) -> List[Step]:
         """
-        {{placeholder}} değerlerini data'dan al
+        Template JSON'u bir kez parse edip element başına bir adıma (closure) çevir
+        Align/size/bold komutları, statik metinler ve placeholder bölümleri
+        derlemede hazırlanır; aynı template'le gelen siparişlerde tekrar yapılmaz.
+        Planlar template metnine göre cache'lenir (PLAN_CACHE_SIZE, LRU).
         """
-        def replacer(match):
-            key = match.group(1)
-            value = self._get_nested_value(data, key)
-            if value is None:
-                return ""
-            return str(value)
+        plan = self._plan_cache.get(template_json)
+        if plan is not None:
+            self._plan_cache.move_to_end(template_json)
+            return plan
 
-        return re.sub(r'\{\{(\w+(?:\.\w+)*)\}\}', replacer, text)
+        template = _json_loads(template_json)
+        width = template.get("width", self.default_width)
 
-    def _render_element(self, elem_type: str, element: dict, data: dict, width: int) -> bytes:
-        """Element tipine göre render et"""
+        plan = []
+        # Ardışık sabit bytes (INIT dahil) tek parçada birleştirilir;
+        # sadece siparişe bağlı bir adım gelince plana eklenir
+        pending = [INIT, SELECT_CHARSET]
+        for element in template.get("elements", []):
+            compiled = self._compile_element(element.get("t", "text"), element, width)
+            if compiled is None:
+                continue
+            # Conditional check
+            cond = element.get("cond")
+            if cond:
+                if isinstance(compiled, bytes):
+                    compiled = _constant_step(compiled)
+                compiled = self._with_condition(cond, compiled)
+            if isinstance(compiled, bytes):
+                pending.append(compiled)
+                continue
+            if pending:
+                plan.append(_constant_step(b"".join(pending)))
+                pending = []
+            plan.append(compiled)
+        if pending:
+            plan.append(_constant_step(b"".join(pending)))
+
+        self._plan_cache[template_json] = plan
+        if len(self._plan_cache) > PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return plan
+
+    def _compile_element(self, elem_type: str, element: dict, width: int) -> Optional[Compiled]:
+        """Element tipine göre adım oluştur"""
         if elem_type == "text":
-            return self._render_text(element, data)
+            return self._compile_text(element)
         elif elem_type == "line":
-            return self._render_line(element, width)
+            return self._compile_line(element, width)
         elif elem_type == "row":
-            return self._render_row(element, data, width)
+            return self._compile_row(element, width)
         elif elem_type == "feed":
-            return self._render_feed(element)
+            return self._compile_feed(element)
         elif elem_type == "items":
-            return self._render_items(element, data, width)
+            return self._compile_items(element, width)
         elif elem_type == "cut":
-            return self._render_cut(element)
+            return self._compile_cut(element)
         else:
             logger.warning(f"Unknown element type: {elem_type}")
-            return b""
+            return None
 
-    def _render_text(self, element: dict, data: dict) -> bytes:
-        """Text elementi render et"""
-        output = bytearray()
+    def _with_condition(self, cond: str, step: Step) -> Step:
+        """Adımı sadece cond alanı truthy ise çalıştır"""
+        keys = _split_key(cond)
+        is_truthy = self._is_truthy
 
-        # Alignment
-        align = element.get("a", "l")
-        output.extend(get_align_command(align))
+        def conditional(data: dict, parts: List[bytes]) -> None:
+            if is_truthy(_lookup(data, keys)):
+                step(data, parts)
 
-        # Size
-        size = element.get("s", "md")
-        output.extend(get_size_command(size))
+        return conditional
 
-        # Bold
-        if element.get("b", False):
-            output.extend(BOLD_ON)
+    def _compile_placeholders(self, text: str) -> Optional[Callable[[dict], str]]:
+        """
+        {{placeholder}}'lı metni (literal, key) bölümlerine ayır
+        Placeholder yoksa None - metin statiktir, derlemede encode edilebilir
+        """
+        if "{{" not in text:
+            return None
+        pieces = _PLACEHOLDER_RE.split(text)
+        if len(pieces) == 1:
+            return None
 
-        # Text
-        text = element.get("v", "")
-        text = self._replace_placeholders(text, data)
-        output.extend(encode_turkish(text))
-        output.extend(LF)
+        first, literals = pieces[0], pieces[2::2]
+        keys = [_split_key(key) for key in pieces[1::2]]
 
-        # Reset
-        if element.get("b", False):
-            output.extend(BOLD_OFF)
-        output.extend(NORMAL)
-        output.extend(ALIGN_LEFT)
+        if len(keys) == 1 and not first and not literals[0]:
+            # Sadece "{{key}}" (row'un sağ tarafında tipik) - join gerekmez
+            only_key = keys[0]
 
-        return bytes(output)
+            def substitute_one(data: dict) -> str:
+                value = _lookup(data, only_key)
+                return "" if value is None else str(value)
 
-    def _render_line(self, element: dict, width: int) -> bytes:
-        """Yatay çizgi render et"""
-        char = element.get("c", "-")
-        line = char * width
-        output = bytearray()
-        output.extend(encode_turkish(line))
-        output.extend(LF)
-        return bytes(output)
+            return substitute_one
 
-    def _render_row(self, element: dict, data: dict, width: int) -> bytes:
-        """Sol-sağ hizalı satır render et"""
-        output = bytearray()
+        def substitute(data: dict) -> str:
+            out = [first]
+            for key, literal in zip(keys, literals):
+                value = _lookup(data, key)
+                if value is not None:
+                    out.append(str(value))
+                out.append(literal)
+            return "".join(out)
 
-        # Size
-        size = element.get("s", "md")
-        output.extend(get_size_command(size))
+        return substitute
 
-        # Bold
-        if element.get("b", False):
-            output.extend(BOLD_ON)
+    def _check_condition(self, cond: str, data: dict) -> bool:
+        """
+        Condition kontrolü
+        cond = "fieldName" → data'da fieldName varsa ve truthy ise True
+        """
+        return self._is_truthy(self._get_nested_value(data, cond))
 
-        left = self._replace_placeholders(element.get("l", ""), data)
-        right = self._replace_placeholders(element.get("r", ""), data)
+    @staticmethod
+    def _is_truthy(value: Any) -> bool:
+        """Condition değeri truthy mi (None/False/0/""/[] → False)"""
+        if value is None:
+            return False
+        check = _COND_TRUTHY.get(type(value))
+        return check(value) if check is not None else True
+
+    def _get_nested_value(self, data: dict, key: str) -> Any:
+        """
+        Nested key erişimi: "order.items" → data["order"]["items"]
+        """
+        return _lookup(data, _split_key(key))
+
+    def _compile_text(self, element: dict) -> Compiled:
+        """Text elementi"""
+        bold = element.get("b", False)
+        # Alignment + Size + Bold
+        prefix = (
+            get_align_command(element.get("a", "l"))
+            + get_size_command(element.get("s", "md"))
+            + (BOLD_ON if bold else b"")
+        )
+        # Reset
+        suffix = LF + (BOLD_OFF if bold else b"") + NORMAL + ALIGN_LEFT
+
+        text = element.get("v", "")
+        if "{{" not in text:
+            return prefix + encode_turkish(text) + suffix
+        pieces = _PLACEHOLDER_RE.split(text)
+        if len(pieces) == 1:
+            return prefix + encode_turkish(text) + suffix
+
+        # Literal bölümler derlemede encode edilir (encode_turkish karakter bazlı),
+        # render'da sadece placeholder değerleri encode edilir
+        head = prefix + encode_turkish(pieces[0])
+        segments = [
+            (_split_key(key), encode_turkish(literal))
+            for key, literal in zip(pieces[1::2], pieces[2::2])
+        ]
+        segments[-1] = (segments[-1][0], segments[-1][1] + suffix)
+        encode = encode_turkish
+
+        def render_text(data: dict, parts: List[bytes]) -> None:
+            parts.append(head)
+            for key, literal in segments:
+                value = _lookup(data, key)
+                if value is not None:
+                    parts.append(encode(str(value)))
+                parts.append(literal)
+
+        return render_text
+
+    def _compile_line(self, element: dict, width: int) -> Compiled:
+        """Yatay çizgi"""
+        char = element.get("c", "-")
+        return encode_turkish(char * width) + LF
+
+    def _compile_row(self, element: dict, width: int) -> Compiled:
+        """Sol-sağ hizalı satır"""
+        size = element.get("s", "md")
+        bold = element.get("b", False)
+        prefix = get_size_command(size) + (BOLD_ON if bold else b"")
+        suffix = LF + (BOLD_OFF if bold else b"") + NORMAL
 
         # Genişliği hesapla (size'a göre ayarla)
         effective_width = width
         if size in ["lg", "xl"]:
             effective_width = width // 2  # Double width'de karakter sayısı yarıya düşer
 
-        # Boşluk hesapla
-        spaces = effective_width - len(left) - len(right)
-        if spaces < 1:
-            spaces = 1
+        def row_text(left: str, right: str) -> str:
+            # Sağa yasla, arada en az 1 boşluk
+            return left.ljust(max(effective_width - len(right), len(left) + 1)) + right
 
-        row_text = left + (" " * spaces) + right
-        output.extend(encode_turkish(row_text))
-        output.extend(LF)
+        left = element.get("l", "")
+        right = element.get("r", "")
+        left_sub = self._compile_placeholders(left)
+        right_sub = self._compile_placeholders(right)
+        if left_sub is None and right_sub is None:
+            return prefix + encode_turkish(row_text(left, right)) + suffix
 
-        # Reset
-        if element.get("b", False):
-            output.extend(BOLD_OFF)
-        output.extend(NORMAL)
+        encode = encode_turkish
+
+        def render_row(data: dict, parts: List[bytes]) -> None:
+            parts.append(prefix)
+            parts.append(encode(row_text(
+                left_sub(data) if left_sub else left,
+                right_sub(data) if right_sub else right
+            )))
+            parts.append(suffix)
 
-        return bytes(output)
+        return render_row
 
-    def _render_feed(self, element: dict) -> bytes:
+    def _compile_feed(self, element: dict) -> Compiled:
         """Satır boşluğu"""
         n = element.get("n", 1)
         return feed_lines(n)
 
-    def _render_items(self, element: dict, data: dict, width: int) -> bytes:
-        """Ürün listesi render et - tam destek: option fiyat, addon miktar, subItems"""
-        output = bytearray()
-
-        items = data.get("items", [])
+    def _compile_items(self, element: dict, width: int) -> Step:
+        """Ürün listesi - tam destek: option fiyat, addon miktar, subItems
+        Element seçenekleri derlemede okunur; döngü her siparişte çalışır."""
         show_qty = element.get("showQuantity", True)
         show_price = element.get("showPrice", True)
         show_addons = element.get("showAddons", True)
@@ -230,194 +405,205 @@ class TemplateRenderer:
         note_prefix = element.get("notePrefix", "  * ")
         removed_prefix = element.get("removedPrefix", "  - CIKART: ")
 
-        output.extend(get_size_command(font_size))
-
-        for item in items:
-            # === ANA URUN SATIRI ===
-            qty = item.get("quantity", 1)
-            name = item.get("productName", item.get("name", ""))
-            price = item.get("unitPrice", item.get("price", 0))
-
-            output.extend(BOLD_ON)
-
-            if show_qty and show_price:
+        # Prefix'ler element başına bir kez encode edilir (her addon/subItem'da değil)
+        addon_prefix_b = encode_turkish(addon_prefix)
+        sub_item_prefix_b = encode_turkish(sub_item_prefix)
+        note_prefix_b = encode_turkish(note_prefix)
+        removed_prefix_b = encode_turkish(removed_prefix)
+        # Alt seviye (subItem altı) satırlar 4 boşluk girintili
+        sub_addon_prefix_b = b"    " + addon_prefix_b
+        sub_removed_prefix_b = b"    " + removed_prefix_b
+        lf_bold_off = LF + BOLD_OFF
+        size_cmd = get_size_command(font_size)
+        encode = encode_turkish
+
+        # Ana satır ve fiyat eki formatı gösterim bayraklarına göre bir kez seçilir
+        if show_qty and show_price:
+            def format_main(qty: Any, name: str, price: float) -> str:
                 left = f"{qty}x {name}"
-                right = f"{price:.2f}"
-                spaces = width - len(left) - len(right)
-                if spaces < 1:
-                    spaces = 1
-                line = left + (" " * spaces) + right
-            elif show_qty:
-                line = f"{qty}x {name}"
-            elif show_price:
-                line = f"{name}  {price:.2f}"
-            else:
-                line = name
-
-            output.extend(encode_turkish(line))
-            output.extend(LF)
-            output.extend(BOLD_OFF)
-
-            # === SECILEN OPSIYON (fiyat dahil) ===
-            if show_option:
-                selected_option = item.get("selectedOption")
-                option_price = item.get("selectedOptionPrice", 0)
-                if selected_option:
-                    if isinstance(selected_option, dict):
-                        opt_name = selected_option.get("optionName", "")
-                        option_price = selected_option.get("priceModifier", option_price)
-                    else:
-                        opt_name = str(selected_option)
-
-                    if opt_name:
-                        if show_price and option_price and option_price != 0:
-                            sign = "+" if option_price > 0 else ""
-                            output.extend(encode_turkish(f"  ({opt_name} {sign}{option_price:.2f})"))
-                        else:
-                            output.extend(encode_turkish(f"  ({opt_name})"))
-                        output.extend(LF)
-
-            # === CIKARILAN MALZEMELER (belirgin sekilde) ===
-            if show_removed:
-                removed = item.get("removedIngredients", [])
-                # removedIngredientsText varsa onu kullan (hazir formatli)
-                removed_text = item.get("removedIngredientsText")
-                if removed_text:
-                    output.extend(BOLD_ON)
-                    output.extend(encode_turkish(f"  {removed_text}"))
-                    output.extend(LF)
-                    output.extend(BOLD_OFF)
-                elif removed:
-                    output.extend(BOLD_ON)
-                    ing_names = []
-                    for ing in removed:
-                        if isinstance(ing, dict):
-                            ing_names.append(ing.get("ingredientName", ing.get("name", "")))
-                        else:
-                            ing_names.append(str(ing))
-                    if ing_names:
-                        output.extend(encode_turkish(f"{removed_prefix}{', '.join(ing_names)}"))
-                        output.extend(LF)
-                    output.extend(BOLD_OFF)
-
-            # === EKLENTILER (Addons) - miktar ve fiyat dahil ===
-            if show_addons:
-                addons = item.get("addons", [])
-                for addon in addons:
-                    addon_name = addon.get("addonName", addon.get("name", ""))
-                    addon_qty = addon.get("quantity", addon.get("quantityPerParent", 1))
-                    addon_unit_price = addon.get("unitPrice", addon.get("price", 0))
-                    addon_line_total = addon.get("lineTotal", addon_unit_price * addon_qty)
-                    related_option = addon.get("relatedOptionName")
-
-                    # Addon satiri olustur
-                    if addon_qty > 1:
-                        addon_text = f"{addon_prefix}{addon_qty}x {addon_name}"
-                    else:
-                        addon_text = f"{addon_prefix}{addon_name}"
-
-                    # İliskili opsiyon varsa ekle
-                    if related_option:
-                        addon_text += f" ({related_option})"
-
-                    # Fiyat ekle
-                    if show_price and addon_line_total > 0:
-                        addon_text += f"  +{addon_line_total:.2f}"
-
-                    output.extend(encode_turkish(addon_text))
-                    output.extend(LF)
-
-            # === SET MENU ALT OGELERI (SubItems) ===
-            if show_sub_items:
-                sub_items = item.get("subItems", [])
-                for sub in sub_items:
-                    sub_title = sub.get("displayTitle", "")
-                    sub_name = sub.get("itemName", sub.get("name", ""))
-                    sub_qty = sub.get("quantity", sub.get("quantityPerParent", 1))
-                    sub_additional_price = sub.get("additionalPrice", 0)
-
-                    # SubItem satiri
-                    if sub_title:
-                        sub_text = f"{sub_item_prefix}{sub_title}: "
-                    else:
-                        sub_text = f"{sub_item_prefix}"
-
-                    if sub_qty > 1:
-                        sub_text += f"{sub_qty}x {sub_name}"
-                    else:
-                        sub_text += sub_name
-
-                    if show_price and sub_additional_price > 0:
-                        sub_text += f"  +{sub_additional_price:.2f}"
-
-                    output.extend(encode_turkish(sub_text))
-                    output.extend(LF)
-
-                    # SubItem cikarilan malzemeler
-                    if show_removed:
-                        sub_removed_text = sub.get("removedIngredientsText")
-                        sub_removed = sub.get("removedIngredients", [])
-                        if sub_removed_text:
-                            output.extend(BOLD_ON)
-                            output.extend(encode_turkish(f"    {sub_removed_text}"))
-                            output.extend(LF)
-                            output.extend(BOLD_OFF)
-                        elif sub_removed:
-                            output.extend(BOLD_ON)
-                            sub_ing_names = [str(ing) if not isinstance(ing, dict) else ing.get("ingredientName", "") for ing in sub_removed]
-                            if sub_ing_names:
-                                output.extend(encode_turkish(f"    {removed_prefix}{', '.join(sub_ing_names)}"))
-                                output.extend(LF)
-                            output.extend(BOLD_OFF)
-
-                    # SubItem addonlari
-                    if show_addons:
-                        sub_addons = sub.get("addons", [])
-                        for sub_addon in sub_addons:
-                            sa_name = sub_addon.get("addonName", sub_addon.get("name", ""))
-                            sa_qty = sub_addon.get("quantity", sub_addon.get("quantityPerParent", 1))
-                            sa_price = sub_addon.get("lineTotal", sub_addon.get("unitPrice", 0))
-
-                            if sa_qty > 1:
-                                sa_text = f"    {addon_prefix}{sa_qty}x {sa_name}"
-                            else:
-                                sa_text = f"    {addon_prefix}{sa_name}"
-
-                            if show_price and sa_price > 0:
-                                sa_text += f"  +{sa_price:.2f}"
-
-                            output.extend(encode_turkish(sa_text))
-                            output.extend(LF)
-
-            # === URUN NOTU ===
-            if show_notes:
-                item_note = item.get("note")
-                if item_note:
-                    output.extend(encode_turkish(f"{note_prefix}{item_note}"))
-                    output.extend(LF)
+                right = "%.2f" % price
+                return left.ljust(max(width - len(right), len(left) + 1)) + right
+        elif show_qty:
+            def format_main(qty: Any, name: str, price: float) -> str:
+                return f"{qty}x {name}"
+        elif show_price:
+            def format_main(qty: Any, name: str, price: float) -> str:
+                return "%s  %.2f" % (name, price)
+        else:
+            def format_main(qty: Any, name: str, price: float) -> str:
+                return name
 
-            # Urunler arasi bosluk
-            output.extend(LF)
+        if show_price:
+            def price_suffix(amount: float) -> str:
+                return "  +%.2f" % amount if amount > 0 else ""
+        else:
+            def price_suffix(amount: float) -> str:
+                return ""
 
-        output.extend(NORMAL)
-        return bytes(output)
+        # Ürünsüz sipariş: sadece size set/reset (döngü kurulmaz)
+        empty_items = size_cmd + NORMAL
+
+        def render_items(data: dict, parts: List[bytes]) -> None:
+            items = data.get("items") or []
+            if not items:
+                parts.append(empty_items)
+                return
+
+            # Döngüde sık kullanılanlar local (LOAD_FAST)
+            append = parts.append
+            lf, bold_on = LF, BOLD_ON
+            append(size_cmd)
+
+            for item in items:
+                # === ANA URUN SATIRI ===
+                qty = item.get("quantity", 1)
+                name = item.get("productName") or item.get("name", "")
+                price = item.get("unitPrice", item.get("price", 0))
+
+                append(bold_on)
+
+                append(encode(format_main(qty, name, price)))
+                append(lf_bold_off)
+
+                # === SECILEN OPSIYON (fiyat dahil) ===
+                if show_option:
+                    selected_option = item.get("selectedOption")
+                    option_price = item.get("selectedOptionPrice", 0)
+                    if selected_option:
+                        if isinstance(selected_option, dict):
+                            opt_name = selected_option.get("optionName", "")
+                            option_price = selected_option.get("priceModifier", option_price)
+                        else:
+                            opt_name = str(selected_option)
 
-    def _render_cut(self, element: dict) -> bytes:
+                        if opt_name:
+                            if show_price and option_price and option_price != 0:
+                                sign = "+" if option_price > 0 else ""
+                                append(encode("  (%s %s%.2f)" % (opt_name, sign, option_price)))
+                            else:
+                                append(encode(f"  ({opt_name})"))
+                            append(lf)
+
+                # === CIKARILAN MALZEMELER (belirgin sekilde) ===
+                if show_removed:
+                    removed = item.get("removedIngredients", [])
+                    # removedIngredientsText varsa onu kullan (hazir formatli)
+                    removed_text = item.get("removedIngredientsText")
+                    if removed_text:
+                        append(bold_on)
+                        append(encode(f"  {removed_text}"))
+                        append(lf_bold_off)
+                    elif removed:
+                        append(bold_on)
+                        ing_names = []
+                        for ing in removed:
+                            if isinstance(ing, dict):
+                                ing_names.append(ing.get("ingredientName", ing.get("name", "")))
+                            else:
+                                ing_names.append(str(ing))
+                        # removed boş değil → ing_names de boş değil
+                        append(removed_prefix_b)
+                        append(encode(', '.join(ing_names)))
+                        append(lf_bold_off)
+
+                # === EKLENTILER (Addons) - miktar ve fiyat dahil ===
+                if show_addons:
+                    addons = item.get("addons", [])
+                    for addon in addons:
+                        addon_name = addon.get("addonName", addon.get("name", ""))
+                        addon_qty = addon.get("quantity", addon.get("quantityPerParent", 1))
+                        addon_unit_price = addon.get("unitPrice", addon.get("price", 0))
+                        addon_line_total = addon.get("lineTotal", addon_unit_price * addon_qty)
+                        related_option = addon.get("relatedOptionName")
+
+                        # Addon satiri: [miktar] ad [(iliskili opsiyon)] [+fiyat] - tek f-string
+                        qty_str = f"{addon_qty}x " if addon_qty > 1 else ""
+                        opt_suffix = f" ({related_option})" if related_option else ""
+
+                        append(addon_prefix_b)
+                        append(encode(
+                            f"{qty_str}{addon_name}{opt_suffix}{price_suffix(addon_line_total)}"
+                        ))
+                        append(lf)
+
+                # === SET MENU ALT OGELERI (SubItems) ===
+                if show_sub_items:
+                    sub_items = item.get("subItems", [])
+                    for sub in sub_items:
+                        sub_title = sub.get("displayTitle", "")
+                        sub_name = sub.get("itemName", sub.get("name", ""))
+                        sub_qty = sub.get("quantity", sub.get("quantityPerParent", 1))
+                        sub_additional_price = sub.get("additionalPrice", 0)
+
+                        # SubItem satiri: [baslik: ][miktar] ad [+fiyat]
+                        title_str = f"{sub_title}: " if sub_title else ""
+                        qty_str = f"{sub_qty}x " if sub_qty > 1 else ""
+
+                        append(sub_item_prefix_b)
+                        append(encode(
+                            f"{title_str}{qty_str}{sub_name}{price_suffix(sub_additional_price)}"
+                        ))
+                        append(lf)
+
+                        # SubItem cikarilan malzemeler
+                        if show_removed:
+                            sub_removed_text = sub.get("removedIngredientsText")
+                            sub_removed = sub.get("removedIngredients", [])
+                            if sub_removed_text:
+                                append(bold_on)
+                                append(encode(f"    {sub_removed_text}"))
+                                append(lf_bold_off)
+                            elif sub_removed:
+                                append(bold_on)
+                                sub_ing_names = [str(ing) if not isinstance(ing, dict) else ing.get("ingredientName", "") for ing in sub_removed]
+                                append(sub_removed_prefix_b)
+                                append(encode(', '.join(sub_ing_names)))
+                                append(lf_bold_off)
+
+                        # SubItem addonlari
+                        if show_addons:
+                            sub_addons = sub.get("addons", [])
+                            for sub_addon in sub_addons:
+                                sa_name = sub_addon.get("addonName", sub_addon.get("name", ""))
+                                sa_qty = sub_addon.get("quantity", sub_addon.get("quantityPerParent", 1))
+                                sa_price = sub_addon.get("lineTotal", sub_addon.get("unitPrice", 0))
+
+                                qty_str = f"{sa_qty}x " if sa_qty > 1 else ""
+                                append(sub_addon_prefix_b)
+                                append(encode(f"{qty_str}{sa_name}{price_suffix(sa_price)}"))
+                                append(lf)
+
+                # === URUN NOTU ===
+                if show_notes:
+                    item_note = item.get("note")
+                    if item_note:
+                        append(note_prefix_b)
+                        append(encode(str(item_note)))
+                        append(lf)
+
+                # Urunler arasi bosluk
+                append(lf)
+
+            append(NORMAL)
+
+        return render_items
+
+    def _compile_cut(self, element: dict) -> Compiled:
         """Kağıt kesimi"""
         partial = element.get("partial", False)
         return CUT_PARTIAL if partial else CUT_FULL
 
     def _render_error(self, message: str) -> bytes:
         """Hata durumunda basit fiş"""
-        output = bytearray()
-        output.extend(INIT)
-        output.extend(ALIGN_CENTER)
-        output.extend(BOLD_ON)
-        output.extend(encode_turkish("=== HATA ==="))
-        output.extend(LF)
-        output.extend(BOLD_OFF)
-        output.extend(encode_turkish(message))
-        output.extend(LF)
-        output.extend(feed_lines(3))
-        output.extend(CUT_FULL)
-        return bytes(output)
+        parts = []
+        parts.append(INIT)
+        parts.append(ALIGN_CENTER)
+        parts.append(BOLD_ON)
+        parts.append(encode_turkish("=== HATA ==="))
+        parts.append(LF)
+        parts.append(BOLD_OFF)
+        parts.append(encode_turkish(message))
+        parts.append(LF)
+        parts.append(feed_lines(3))
+        parts.append(CUT_FULL)
+        return b"".join(parts)
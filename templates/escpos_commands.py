@@ -3,50 +3,53 @@ ESC/POS Command Constants
 Thermal printer byte sequences
 """
 
+from functools import lru_cache
+from typing import Final
+
 # Control characters
-ESC = b'\x1b'
-GS = b'\x1d'
-LF = b'\x0a'
+ESC: Final = b'\x1b'
+GS: Final = b'\x1d'
+LF: Final = b'\x0a'
 
 # === Initialization ===
 # Xprinter ve benzeri yazıcılar için güçlü başlatma sekansı
-INIT = (
+INIT: Final = (
     ESC + b'@' +      # Reset printer
     b'\x00' * 50 +    # Null bytes - yazıcıyı uyandır
     ESC + b'@'        # Reset tekrar
 )
 
 # === Text Formatting ===
-BOLD_ON = ESC + b'E\x01'
-BOLD_OFF = ESC + b'E\x00'
+BOLD_ON: Final = ESC + b'E\x01'
+BOLD_OFF: Final = ESC + b'E\x00'
 
-UNDERLINE_ON = ESC + b'-\x01'
-UNDERLINE_OFF = ESC + b'-\x00'
+UNDERLINE_ON: Final = ESC + b'-\x01'
+UNDERLINE_OFF: Final = ESC + b'-\x00'
 
 # === Text Size ===
 # GS ! n - where n = (width-1) * 16 + (height-1)
-NORMAL = GS + b'!\x00'          # 1x1
-DOUBLE_WIDTH = GS + b'!\x10'    # 2x1
-DOUBLE_HEIGHT = GS + b'!\x01'   # 1x2
-DOUBLE_BOTH = GS + b'!\x11'     # 2x2
+NORMAL: Final = GS + b'!\x00'          # 1x1
+DOUBLE_WIDTH: Final = GS + b'!\x10'    # 2x1
+DOUBLE_HEIGHT: Final = GS + b'!\x01'   # 1x2
+DOUBLE_BOTH: Final = GS + b'!\x11'     # 2x2
 
 # === Alignment ===
-ALIGN_LEFT = ESC + b'a\x00'
-ALIGN_CENTER = ESC + b'a\x01'
-ALIGN_RIGHT = ESC + b'a\x02'
+ALIGN_LEFT: Final = ESC + b'a\x00'
+ALIGN_CENTER: Final = ESC + b'a\x01'
+ALIGN_RIGHT: Final = ESC + b'a\x02'
 
 # === Paper Control ===
 def feed_lines(n: int) -> bytes:
     """n satır boşluk bırak"""
     return ESC + b'd' + bytes([n])
 
-FEED_ONE = feed_lines(1)
-FEED_THREE = feed_lines(3)
+FEED_ONE: Final = feed_lines(1)
+FEED_THREE: Final = feed_lines(3)
 
 # === Cut ===
 # Kesimden önce kağıt besleme eklenir (yazıcı kafası kesim noktasının üstünde)
-CUT_FULL = feed_lines(5) + GS + b'V\x00'     # 5 satır + Tam kesim
-CUT_PARTIAL = feed_lines(5) + GS + b'V\x01'  # 5 satır + Kısmi kesim
+CUT_FULL: Final = feed_lines(5) + GS + b'V\x00'     # 5 satır + Tam kesim
+CUT_PARTIAL: Final = feed_lines(5) + GS + b'V\x01'  # 5 satır + Kısmi kesim
 
 # === Character Set ===
 # ESC t n - Select character code table
@@ -57,16 +60,16 @@ CUT_PARTIAL = feed_lines(5) + GS + b'V\x01'  # 5 satır + Kısmi kesim
 #   Xprinter: CP857 = 37 (0x25)
 #   Generic:  WPC1254 = 38 (0x26)
 #
-CHARSET_PC437 = ESC + b't\x00'      # USA Standard Europe
-CHARSET_PC850 = ESC + b't\x02'      # Multilingual
-CHARSET_PC857_EPSON = ESC + b't\x12'  # Turkish - Epson (18)
-CHARSET_PC857_XPRINTER = ESC + b't\x25'  # Turkish - Xprinter (37)
-CHARSET_WPC1254 = ESC + b't\x26'    # Windows-1254 Turkish (38)
-CHARSET_PC858 = ESC + b't\x13'      # Euro
+CHARSET_PC437: Final = ESC + b't\x00'      # USA Standard Europe
+CHARSET_PC850: Final = ESC + b't\x02'      # Multilingual
+CHARSET_PC857_EPSON: Final = ESC + b't\x12'  # Turkish - Epson (18)
+CHARSET_PC857_XPRINTER: Final = ESC + b't\x25'  # Turkish - Xprinter (37)
+CHARSET_WPC1254: Final = ESC + b't\x26'    # Windows-1254 Turkish (38)
+CHARSET_PC858: Final = ESC + b't\x13'      # Euro
 
 # Default: Xprinter/Chinese printers (en yaygın)
 # Config'den değiştirilebilir: printer.charset = "epson" veya "xprinter"
-SELECT_CHARSET = CHARSET_PC857_XPRINTER
+SELECT_CHARSET: Final = CHARSET_PC857_XPRINTER
 
 def get_charset_command(charset_type: str = "xprinter") -> bytes:
     """Yazıcı tipine göre charset komutu döndür"""
@@ -81,17 +84,17 @@ def get_charset_command(charset_type: str = "xprinter") -> bytes:
 
 # === International Character Set ===
 # ESC R n - Select international character set
-INTL_USA = ESC + b'R\x00'
-INTL_FRANCE = ESC + b'R\x01'
-INTL_GERMANY = ESC + b'R\x02'
-INTL_UK = ESC + b'R\x03'
-INTL_DENMARK = ESC + b'R\x04'
-INTL_SWEDEN = ESC + b'R\x05'
-INTL_ITALY = ESC + b'R\x06'
-INTL_SPAIN = ESC + b'R\x07'
+INTL_USA: Final = ESC + b'R\x00'
+INTL_FRANCE: Final = ESC + b'R\x01'
+INTL_GERMANY: Final = ESC + b'R\x02'
+INTL_UK: Final = ESC + b'R\x03'
+INTL_DENMARK: Final = ESC + b'R\x04'
+INTL_SWEDEN: Final = ESC + b'R\x05'
+INTL_ITALY: Final = ESC + b'R\x06'
+INTL_SPAIN: Final = ESC + b'R\x07'
 
 # === Line Spacing ===
-LINE_SPACING_DEFAULT = ESC + b'2'           # Default spacing
+LINE_SPACING_DEFAULT: Final = ESC + b'2'           # Default spacing
 
 
 def line_spacing_set(n: int) -> bytes:
@@ -100,35 +103,39 @@ def line_spacing_set(n: int) -> bytes:
 
 # === Helper Functions ===
 
+# Size / alignment string → ESC/POS komutu
+_SIZE_MAP: Final = {
+    "xs": NORMAL,
+    "sm": NORMAL,
+    "md": NORMAL,
+    "lg": DOUBLE_WIDTH,
+    "xl": DOUBLE_BOTH
+}
+
+_ALIGN_MAP: Final = {
+    "l": ALIGN_LEFT,
+    "c": ALIGN_CENTER,
+    "r": ALIGN_RIGHT,
+    "left": ALIGN_LEFT,
+    "center": ALIGN_CENTER,
+    "right": ALIGN_RIGHT
+}
+
+
 def get_size_command(size: str) -> bytes:
     """Size string'den ESC/POS komutu al"""
-    sizes = {
-        "xs": NORMAL,
-        "sm": NORMAL,
-        "md": NORMAL,
-        "lg": DOUBLE_WIDTH,
-        "xl": DOUBLE_BOTH
-    }
-    return sizes.get(size, NORMAL)
+    return _SIZE_MAP.get(size, NORMAL)
 
 
 def get_align_command(align: str) -> bytes:
     """Alignment string'den ESC/POS komutu al"""
-    alignments = {
-        "l": ALIGN_LEFT,
-        "c": ALIGN_CENTER,
-        "r": ALIGN_RIGHT,
-        "left": ALIGN_LEFT,
-        "center": ALIGN_CENTER,
-        "right": ALIGN_RIGHT
-    }
-    return alignments.get(align, ALIGN_LEFT)
+    return _ALIGN_MAP.get(align, ALIGN_LEFT)
 
 
 # === Turkish Character Mapping ===
 # CP857 encoding için Türkçe karakterler
 # Referans: https://en.wikipedia.org/wiki/Code_page_857
-TURKISH_CHARS = {
+TURKISH_CHARS: Final = {
     'ç': b'\x87',    # c with cedilla (lowercase) - 0x87
     'Ç': b'\x80',    # C with cedilla (uppercase) - 0x80
     'ğ': b'\xa7',    # g with breve (lowercase) - 0xA7
@@ -145,7 +152,7 @@ TURKISH_CHARS = {
 
 
 # Türkçe → ASCII dönüşüm tablosu
-TURKISH_TO_ASCII = {
+TURKISH_TO_ASCII: Final = {
     'ç': 'c', 'Ç': 'C',
     'ğ': 'g', 'Ğ': 'G',
     'ı': 'i', 'İ': 'I',
@@ -154,17 +161,15 @@ TURKISH_TO_ASCII = {
     'ü': 'u', 'Ü': 'U',
 }
 
+# str.translate tablosu (code point → karşılık) - tek C çağrısı
+_TURKISH_TRANSLATE: Final = str.maketrans(TURKISH_TO_ASCII)
+
+# Tekrarlanan metinler (ürün/addon adları, etiketler) render'lar arası cache'lenir
+@lru_cache(maxsize=1024)
 def encode_turkish(text: str) -> bytes:
     """
     Türkçe karakterleri ASCII karşılıklarına çevir
     ı→i, ğ→g, ü→u, ş→s, ö→o, ç→c
     """
-    result = []
-    for char in text:
-        if char in TURKISH_TO_ASCII:
-            result.append(TURKISH_TO_ASCII[char])
-        else:
-            result.append(char)
-
     # ASCII'ye encode et
-    return ''.join(result).encode('ascii', errors='replace')
+    return text.translate(_TURKISH_TRANSLATE).encode('ascii', errors='replace')
@@ -0,0 +1,142 @@
+"""
+FeedemyApiClient testleri
+complete/fail durumlarının bulk-status isteğinde toplanması ve eski backend'e geri düşüş
+"""
+
+import unittest
+
+from src import api_client
+from src.api_client import FeedemyApiClient, ApiError, FailResponse
+
+BULK_STATUS = "/api/printer-device/jobs/bulk-status"
+
+
+class FakeBackend:
+    """_request_once yerine geçer: istekleri kaydeder, endpoint'e göre cevap verir"""
+
+    def __init__(self, responses=None):
+        self.calls = []
+        self.responses = responses or {}
+
+    async def __call__(self, method, endpoint, json_data=None, **kwargs):
+        self.calls.append((method, endpoint, json_data))
+        response = self.responses.get(endpoint)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def endpoints(self):
+        return [endpoint for _, endpoint, _ in self.calls]
+
+
+class ApiClientTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client = FeedemyApiClient("https://api.example.com", token="token")
+        self.backend = FakeBackend()
+        self.client._request_once = self.backend
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await api_client.close_shared_connector()
+
+
+class BulkStatusTest(ApiClientTestCase):
+
+    async def test_payload_and_results(self):
+        self.backend.responses[BULK_STATUS] = {
+            "completed": ["a"],
+            "failed": [{"jobGuid": "c", "willRetry": True}],
+        }
+        results = await self.client._post_bulk_status([
+            ("a", None), ("b", None), ("c", "Paper out"),
+        ])
+
+        self.assertEqual(self.backend.calls, [("POST", BULK_STATUS, {
+            "completed": ["a", "b"],
+            "failed": [{"jobGuid": "c", "errorMessage": "Paper out"}],
+        })])
+        self.assertIs(results["a"], True)
+        # Sunucunun kabul etmediği completed job hata olarak döner
+        self.assertIsInstance(results["b"], ApiError)
+        self.assertEqual(results["c"], FailResponse(will_retry=True))
+
+    async def test_empty_body_accepts_all(self):
+        results = await self.client._post_bulk_status([("a", None), ("b", "Paper out")])
+        self.assertEqual(results, {"a": True, "b": FailResponse(will_retry=False)})
+
+    async def test_falls_back_to_per_job_endpoints(self):
+        self.backend.responses = {
+            BULK_STATUS: ApiError("Not Found", status=404),
+            "/api/printer-device/jobs/b/fail": {"willRetry": True},
+            "/api/printer-device/jobs/c/complete": ApiError("Job not claimed", status=409),
+        }
+        results = await self.client._send_status_batch([
+            ("a", None), ("b", "Paper out"), ("c", None),
+        ])
+
+        self.assertEqual(self.backend.endpoints(), [
+            BULK_STATUS,
+            "/api/printer-device/jobs/a/complete",
+            "/api/printer-device/jobs/b/fail",
+            "/api/printer-device/jobs/c/complete",
+        ])
+        self.assertIs(results["a"], True)
+        self.assertEqual(results["b"], FailResponse(will_retry=True))
+        self.assertIsInstance(results["c"], ApiError)
+
+        # Desteklenmediği öğrenildi - sonraki batch'ler bulk'u denemez
+        await self.client.complete_jobs(["d"])
+        self.assertEqual(self.backend.endpoints()[-1], "/api/printer-device/jobs/d/complete")
+        self.assertEqual(self.backend.endpoints().count(BULK_STATUS), 1)
+
+    async def test_server_error_not_treated_as_unsupported(self):
+        self.backend.responses[BULK_STATUS] = ApiError("Internal error", status=500)
+        with self.assertRaises(ApiError):
+            await self.client._send_status_batch([("a", None)])
+        self.assertTrue(self.client._bulk_supported)
+
+
+class JobStatusTest(ApiClientTestCase):
+
+    async def test_batch_goes_in_one_request(self):
+        self.backend.responses[BULK_STATUS] = {"completed": ["a", "b", "c"]}
+        results = await self.client.complete_jobs(["a", "b", "c"])
+
+        self.assertEqual(results, {"a": True, "b": True, "c": True})
+        self.assertEqual(self.backend.calls, [
+            ("POST", BULK_STATUS, {"completed": ["a", "b", "c"], "failed": []}),
+        ])
+
+    async def test_batch_size_limits_request(self):
+        self.client.batch_size = 2
+        await self.client.complete_jobs(list("abcde"))
+        self.assertEqual(
+            [json_data["completed"] for _, _, json_data in self.backend.calls],
+            [["a", "b"], ["c", "d"], ["e"]]
+        )
+
+    async def test_empty_batch_sends_nothing(self):
+        self.assertEqual(await self.client.complete_jobs([]), {})
+        self.assertEqual(await self.client.fail_jobs([]), {})
+        self.assertEqual(self.backend.calls, [])
+
+    async def test_single_job_sent_immediately(self):
+        self.assertTrue(await self.client.complete_job("a"))
+        self.assertEqual(
+            await self.client.fail_job("b", "Paper out"),
+            FailResponse(will_retry=False)
+        )
+        self.assertEqual(self.backend.endpoints(), [BULK_STATUS, BULK_STATUS])
+
+    async def test_request_error(self):
+        self.backend.responses[BULK_STATUS] = ApiError("Internal error", status=500)
+        self.assertFalse(await self.client.complete_job("a"))
+        with self.assertRaises(ApiError):
+            await self.client.fail_job("b", "Paper out")
+        with self.assertRaises(ApiError):
+            await self.client.fail_jobs([("c", "Paper out")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+AutoUpdater testleri
+requirements.txt diff'inden sadece değişen paket satırlarının çıkarılması,
+local HEAD'in git process'i olmadan okunması
+"""
+
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.auto_updater import AutoUpdater
+
+
+def _diff(*lines: str) -> str:
+    header = [
+        "diff --git a/requirements.txt b/requirements.txt",
+        "index 1111111..2222222 100644",
+        "--- a/requirements.txt",
+        "+++ b/requirements.txt",
+        "@@ -1,3 +1,3 @@",
+    ]
+    return "\n".join(header + list(lines)) + "\n"
+
+
+class ChangedRequirementsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.updater = AutoUpdater(repo_path="/tmp/feedemy-test", branch="main")
+
+    def changed(self, stdout: str, returncode: int = 0):
+        result = subprocess.CompletedProcess(
+            args=[], returncode=returncode, stdout=stdout, stderr="fatal: bad revision"
+        )
+        with mock.patch("src.auto_updater.subprocess.run", return_value=result) as run:
+            changed = self.updater._changed_requirements("abc123")
+        self.assertEqual(run.call_args[0][0][:4], ["git", "diff", "-U0", "abc123..HEAD"])
+        return changed
+
+    def test_added_and_upgraded_packages(self):
+        self.assertEqual(self.changed(_diff(
+            "-aiohttp>=3.8.0",
+            "+aiohttp>=3.9.0",
+            "+orjson>=3.9  # opsiyonel",
+        )), ["aiohttp>=3.9.0", "orjson>=3.9"])
+
+    def test_no_diff(self):
+        self.assertEqual(self.changed(""), [])
+
+    def test_removed_only(self):
+        self.assertEqual(self.changed(_diff("-ijson>=3.2")), [])
+
+    def test_formatting_only_change(self):
+        # Yorum/boş satır değişiklikleri ve aynı spec'in yer değiştirmesi kurulum gerektirmez
+        self.assertEqual(self.changed(_diff(
+            "-pyudev>=0.24.0",
+            "-# USB",
+            "+",
+            "+# USB hotplug",
+            "+pyudev>=0.24.0  # hotplug",
+        )), [])
+
+    def test_pip_option_needs_full_install(self):
+        self.assertIsNone(self.changed(_diff("+--extra-index-url https://piwheels.org/simple")))
+        self.assertIsNone(self.changed(_diff("+-r extra.txt")))
+
+    def test_git_failure_needs_full_install(self):
+        self.assertIsNone(self.changed("", returncode=128))
+
+
+LOCAL = "a" * 40
+REMOTE = "b" * 40
+
+
+class PeekHeadsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.repo = Path(self.tmpdir.name)
+        self.git_dir = self.repo / ".git"
+        (self.git_dir / "refs" / "heads").mkdir(parents=True)
+        self.updater = AutoUpdater(repo_path=self.repo, branch="main")
+
+    def write(self, name: str, content: str) -> None:
+        (self.git_dir / name).write_text(content)
+
+    def peek(self, stdout: str = f"{REMOTE}\trefs/heads/main\n", returncode: int = 0):
+        result = subprocess.CompletedProcess(
+            args=[], returncode=returncode, stdout=stdout, stderr="fatal: no remote"
+        )
+        with mock.patch("src.auto_updater.subprocess.run", return_value=result) as run:
+            heads = self.updater._peek_heads()
+        return heads, [call[0][0] for call in run.call_args_list]
+
+    def test_branch_ref_file(self):
+        self.write("HEAD", "ref: refs/heads/main\n")
+        self.write("refs/heads/main", LOCAL + "\n")
+        heads, commands = self.peek()
+        self.assertEqual(heads, (LOCAL, REMOTE))
+        # Sadece ls-remote spawn edilir
+        self.assertEqual(commands, [["git", "ls-remote", "origin", "refs/heads/main"]])
+
+    def test_packed_refs(self):
+        self.write("HEAD", "ref: refs/heads/main\n")
+        self.write("packed-refs", "\n".join([
+            "# pack-refs with: peeled fully-peeled sorted",
+            f"{'c' * 40} refs/heads/other",
+            f"{LOCAL} refs/heads/main",
+            f"^{'d' * 40}",
+        ]) + "\n")
+        heads, commands = self.peek()
+        self.assertEqual(heads, (LOCAL, REMOTE))
+        self.assertEqual(len(commands), 1)
+
+    def test_detached_head(self):
+        self.write("HEAD", LOCAL + "\n")
+        self.assertEqual(self.peek()[0], (LOCAL, REMOTE))
+
+    def test_worktree_git_file(self):
+        worktree = self.repo / "wt"
+        worktree_git = self.git_dir / "worktrees" / "wt"
+        worktree_git.mkdir(parents=True)
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {worktree_git}\n")
+        (worktree_git / "HEAD").write_text("ref: refs/heads/main\n")
+        (worktree_git / "commondir").write_text("../..\n")
+        self.write("refs/heads/main", LOCAL + "\n")
+
+        self.updater = AutoUpdater(repo_path=worktree, branch="main")
+        self.assertEqual(self.peek()[0], (LOCAL, REMOTE))
+
+    def test_unreadable_head_falls_back_to_rev_parse(self):
+        # Ref hiçbir yerde yok (örn. henüz commit'siz branch) → git rev-parse
+        self.write("HEAD", "ref: refs/heads/main\n")
+        heads, commands = self.peek(stdout=REMOTE + "\n")
+        self.assertEqual(commands[0], ["git", "rev-parse", "HEAD"])
+        self.assertEqual(len(commands), 2)
+
+    def test_remote_branch_missing(self):
+        self.write("HEAD", LOCAL + "\n")
+        self.assertEqual(self.peek(stdout="")[0], (LOCAL, None))
+        self.assertEqual(self.peek(returncode=128)[0], (LOCAL, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+ConfigManager testleri
+Atomik kayıt (.tmp + os.replace) ve değişmeyen içerikte yazmama
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import config_manager
+from src.config_manager import ConfigManager
+
+
+class ConfigSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.config_path = Path(self._tmp.name) / "config" / "config.json"
+
+    def test_default_config_created(self):
+        config = ConfigManager(str(self.config_path))
+        self.assertTrue(self.config_path.exists())
+        self.assertEqual(config.api.base_url, "https://api.feedemy.com")
+        self.assertFalse(self.config_path.with_suffix(".json.tmp").exists())
+
+    def test_save_replaces_file(self):
+        config = ConfigManager(str(self.config_path))
+        config.save_registration("token-1", "token-id", "branch-guid")
+
+        reloaded = ConfigManager(str(self.config_path))
+        self.assertEqual(reloaded.api.token, "token-1")
+        self.assertEqual(reloaded.device.branch_guid, "branch-guid")
+        self.assertFalse(self.config_path.with_suffix(".json.tmp").exists())
+
+    def test_unchanged_content_not_written(self):
+        config = ConfigManager(str(self.config_path))
+        with mock.patch.object(config_manager.os, "replace") as replace:
+            config.update_device_name(config.device.name)
+            replace.assert_not_called()
+            config.update_device_name("Kasa-2")
+            replace.assert_called_once()
+
+    def test_failed_write_keeps_previous_file(self):
+        config = ConfigManager(str(self.config_path))
+        config.save_registration("token-1", "token-id", "branch-guid")
+        previous = self.config_path.read_bytes()
+
+        with mock.patch.object(config_manager.os, "fsync", side_effect=OSError("EIO")):
+            with self.assertRaises(OSError):
+                config.update_device_name("Kasa-2")
+
+        # Yarım yazılan .tmp dosyası gerçek config'in yerini almaz
+        self.assertEqual(self.config_path.read_bytes(), previous)
+        self.assertEqual(ConfigManager(str(self.config_path)).api.token, "token-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
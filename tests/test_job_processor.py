@@ -0,0 +1,163 @@
+"""
+JobProcessor testleri
+Claim edilen batch'in sonuçları tek bulk-status isteğiyle bildirilmeli;
+tek job'ın hatası ya da iptal batch'in diğer job'larını düşürmemeli
+"""
+
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import api_client
+from src.api_client import FeedemyApiClient, JobDetail
+from src.job_processor import JobProcessor
+from src.job_store import JobStore
+from src.printer_manager import PrintResult
+from src.template_renderer import TemplateRenderer
+
+BULK_STATUS = "/api/printer-device/jobs/bulk-status"
+TEMPLATE = json.dumps({"elements": [{"t": "text", "v": "{{orderNo}}"}]})
+
+
+class FakeBackend:
+    """_request_once yerine geçer: istekleri kaydeder, bulk isteği kabul eder"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, method, endpoint, json_data=None, **kwargs):
+        self.calls.append((method, endpoint, json_data))
+        return None
+
+
+class FakePrinterManager:
+    """
+    Yazdırılan fişleri kaydeder; sipariş numarasına göre
+    failing → hata sonucu, raising → exception, blocking → hiç bitmeyen yazdırma
+    """
+
+    def __init__(self, failing=(), raising=(), blocking=()):
+        self.printed = []
+        self.failing = set(failing)
+        self.raising = set(raising)
+        self.blocking = set(blocking)
+        self.blocked = asyncio.Event()
+
+    def has_printer(self):
+        return True
+
+    async def print_parts_async(self, parts, device_path=None):
+        data = b"".join(parts)
+        if any(order.encode() in data for order in self.failing):
+            return PrintResult(success=False, error="Paper out")
+        if any(order.encode() in data for order in self.raising):
+            raise RuntimeError("writer gone")
+        if any(order.encode() in data for order in self.blocking):
+            self.blocked.set()
+            await asyncio.Event().wait()
+        self.printed.append(data)
+        return PrintResult(success=True, bytes_written=len(data))
+
+
+def _job(guid):
+    return JobDetail(
+        job_guid=guid,
+        order_guid=f"order-{guid}",
+        print_template_guid="template",
+        print_data=json.dumps({"orderNo": f"No-{guid}"}),
+        template_content=TEMPLATE,
+        template_version=1,
+    )
+
+
+class ProcessBatchTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(str(Path(self.tmpdir.name) / "jobs.db"))
+        self.api = FeedemyApiClient("https://api.example.com", token="token")
+        self.backend = FakeBackend()
+        self.api._request_once = self.backend
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await api_client.close_shared_connector()
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    async def process(self, jobs, printer_manager):
+        processor = JobProcessor(
+            self.api, self.store, TemplateRenderer(), printer_manager, max_batch=len(jobs)
+        )
+        with mock.patch.object(self.api, "claim_next_job", return_value=jobs[0]), \
+                mock.patch.object(self.api, "claim_more_jobs", return_value=jobs[1:]):
+            self.assertTrue(await processor._process_next_job())
+
+    async def test_batch_reported_in_one_request(self):
+        printer = FakePrinterManager()
+        await self.process([_job("a"), _job("b"), _job("c")], printer)
+
+        self.assertEqual(len(printer.printed), 3)
+        self.assertEqual(self.backend.calls, [
+            ("POST", BULK_STATUS, {"completed": ["a", "b", "c"], "failed": []}),
+        ])
+        for guid in "abc":
+            self.assertTrue(self.store.is_processed(guid))
+
+    async def test_mixed_results(self):
+        # Duplicate (daha önce yazdırılmış) job da aynı batch'te bildirilir
+        self.store.mark_completed("a")
+        printer = FakePrinterManager(failing=["No-c"])
+        await self.process([_job("a"), _job("b"), _job("c")], printer)
+
+        self.assertEqual(len(printer.printed), 1)
+        self.assertEqual(self.backend.calls, [
+            ("POST", BULK_STATUS, {"completed": ["a", "b"], "failed": []}),
+            ("POST", BULK_STATUS, {
+                "completed": [],
+                "failed": [{"jobGuid": "c", "errorMessage": "Paper out"}],
+            }),
+        ])
+
+    async def test_print_exception_keeps_draining(self):
+        printer = FakePrinterManager(raising=["No-b"])
+        await self.process([_job("a"), _job("b"), _job("c")], printer)
+
+        self.assertEqual(len(printer.printed), 2)
+        self.assertEqual(self.backend.calls, [
+            ("POST", BULK_STATUS, {"completed": ["a", "c"], "failed": []}),
+            ("POST", BULK_STATUS, {
+                "completed": [],
+                "failed": [{"jobGuid": "b", "errorMessage": "Print error: writer gone"}],
+            }),
+        ])
+        self.assertEqual(self.store.get_status("b"), "failed")
+
+    async def test_cancel_reports_remaining_jobs(self):
+        printer = FakePrinterManager(blocking=["No-b"])
+        task = asyncio.ensure_future(
+            self.process([_job("a"), _job("b"), _job("c"), _job("d")], printer)
+        )
+        await printer.blocked.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(self.backend.calls, [
+            ("POST", BULK_STATUS, {"completed": ["a"], "failed": []}),
+            ("POST", BULK_STATUS, {
+                "completed": [],
+                "failed": [
+                    {"jobGuid": guid, "errorMessage": "Print interrupted"} for guid in "bcd"
+                ],
+            }),
+        ])
+        # Yazdırılmayan job'lar tekrar geldiğinde yazdırılabilmeli
+        self.assertFalse(self.store.is_processed("b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
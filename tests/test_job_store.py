@@ -0,0 +1,216 @@
+"""
+JobStore testleri
+Kayıt/okuma, eski TEXT şemasından migration, buffer'lı mark + flush ve hata sonrası requeue
+"""
+
+import sqlite3
+import tempfile
+import time
+import unittest
+from calendar import timegm
+from pathlib import Path
+from unittest import mock
+
+from src import job_store
+from src.job_store import JobStore
+
+OLD_SCHEMA = """
+    CREATE TABLE processed_jobs (
+        job_guid TEXT PRIMARY KEY,
+        processed_at TEXT NOT NULL,
+        status TEXT NOT NULL,
+        error TEXT
+    )
+"""
+
+
+def _epoch(iso: str) -> int:
+    return timegm(time.strptime(iso[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+class FailingConnection:
+    """executemany'de sqlite3.Error fırlatan writer sarmalayıcısı"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def execute(self, *args):
+        return self._conn.execute(*args)
+
+    def executemany(self, *args):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    def close(self):
+        self._conn.close()
+
+
+class JobStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "jobs.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def open_store(self) -> JobStore:
+        store = JobStore(str(self.db_path))
+        self.addCleanup(store.close)
+        return store
+
+    def raw_rows(self):
+        with sqlite3.connect(str(self.db_path)) as conn:
+            rows = conn.execute(
+                "SELECT job_guid, processed_at, typeof(processed_at), status, error "
+                "FROM processed_jobs ORDER BY job_guid"
+            ).fetchall()
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        return rows, version
+
+
+class MigrationTest(JobStoreTestCase):
+
+    def test_migrates_iso_text_to_epoch(self):
+        old_rows = [
+            ("a", "2024-01-02T03:04:05.123456", "completed", None),
+            ("b", "2024-05-06T07:08:09", "failed", "Printer offline"),
+        ]
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute(OLD_SCHEMA)
+            conn.executemany("INSERT INTO processed_jobs VALUES (?, ?, ?, ?)", old_rows)
+
+        store = self.open_store()
+
+        rows, version = self.raw_rows()
+        self.assertEqual(version, job_store.SCHEMA_VERSION)
+        self.assertEqual(rows, [
+            ("a", _epoch(old_rows[0][1]), "integer", "completed", None),
+            ("b", _epoch(old_rows[1][1]), "integer", "failed", "Printer offline"),
+        ])
+        self.assertTrue(store.is_processed("a"))
+        self.assertEqual(store.get_status("b"), "failed")
+        # Eski kayıtlar cutoff'a göre silinebilmeli (epoch karşılaştırması)
+        self.assertEqual(store.cleanup_old(days=7), 2)
+
+    def test_integer_table_without_version_is_kept(self):
+        # Migration commit'i ile user_version arasında çökme: tablo zaten INTEGER
+        now = int(time.time())
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute(OLD_SCHEMA.replace("processed_at TEXT", "processed_at INTEGER"))
+            conn.execute("INSERT INTO processed_jobs VALUES ('a', ?, 'completed', NULL)", (now,))
+
+        self.open_store()
+
+        rows, version = self.raw_rows()
+        self.assertEqual(version, job_store.SCHEMA_VERSION)
+        self.assertEqual(rows, [("a", now, "integer", "completed", None)])
+
+    def test_reopen_does_not_migrate_again(self):
+        store = JobStore(str(self.db_path))
+        store.mark_completed("a")
+        store.close()
+
+        with mock.patch.object(JobStore, "_migrate_epoch_timestamps") as migrate:
+            store = self.open_store()
+        migrate.assert_not_called()
+        self.assertEqual(store.get_status("a"), "completed")
+
+
+class FlushTest(JobStoreTestCase):
+
+    def test_marks_buffered_until_flush(self):
+        store = self.open_store()
+        store.mark_completed("a")
+        store.mark_failed("b", "Printer offline")
+
+        self.assertTrue(store.is_processed("a"))
+        self.assertEqual(self.raw_rows()[0], [])
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(store.flush(), 0)
+        rows, _ = self.raw_rows()
+        self.assertEqual([(r[0], r[3], r[4]) for r in rows],
+                         [("a", "completed", None), ("b", "failed", "Printer offline")])
+
+    def test_flush_size_writes_immediately(self):
+        store = self.open_store()
+        for i in range(job_store.MARK_FLUSH_SIZE):
+            store.mark_completed(f"job-{i:02d}")
+        self.assertEqual(len(self.raw_rows()[0]), job_store.MARK_FLUSH_SIZE)
+        self.assertEqual(store._pending, [])
+
+    def test_reads_flush_pending(self):
+        store = self.open_store()
+        store.mark_skipped("a", "Duplicate")
+        self.assertEqual(store.get_status("a"), "skipped")
+        store.mark_completed("b")
+        self.assertEqual(store.get_stats(), {"skipped": 1, "completed": 1, "total": 2})
+
+    def test_upsert_keeps_first_processed_at(self):
+        store = self.open_store()
+        store.mark_failed("a", "Printer offline")
+        store.flush()
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute("UPDATE processed_jobs SET processed_at = 1")
+        store.mark_completed("a")
+        store.flush()
+        self.assertEqual(self.raw_rows()[0], [("a", 1, "integer", "completed", None)])
+
+    def test_failed_flush_requeues_rows(self):
+        store = self.open_store()
+        store.mark_completed("a")
+        store.mark_completed("b")
+
+        writer = store._writer
+        store._writer = FailingConnection(writer)
+        with self.assertRaises(sqlite3.Error):
+            store.flush()
+        # Yeni gelen kayıt requeue edilenlerin arkasına eklenir
+        store.mark_failed("c", "Printer offline")
+        self.assertEqual([row[0] for row in store._pending], ["a", "b", "c"])
+        self.assertEqual(self.raw_rows()[0], [])
+
+        store._writer = writer
+        self.assertEqual(store.flush(), 3)
+        self.assertEqual([row[0] for row in self.raw_rows()[0]], ["a", "b", "c"])
+
+
+class StoreTest(JobStoreTestCase):
+
+    def test_seen_survives_reopen(self):
+        store = JobStore(str(self.db_path))
+        store.mark_completed("a")
+        store.close()
+
+        store = self.open_store()
+        self.assertTrue(store.is_processed("a"))
+        self.assertFalse(store.is_processed("b"))
+        self.assertIsNone(store.get_status("b"))
+
+    def test_status_and_stats(self):
+        store = self.open_store()
+        store.mark_skipped("a", "Duplicate")
+        store.mark_failed("b", "Printer offline")
+        store.mark_completed("b")
+        self.assertEqual(store.get_status("a"), "skipped")
+        self.assertEqual(store.get_status("b"), "completed")
+        self.assertEqual(store.get_stats(), {"skipped": 1, "completed": 1, "total": 2})
+
+    def test_cleanup_old(self):
+        store = self.open_store()
+        store.mark_completed("old")
+        store.mark_completed("new")
+        store.flush()
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute(
+                "UPDATE processed_jobs SET processed_at = ? WHERE job_guid = 'old'",
+                (int(time.time()) - 8 * 86400,)
+            )
+
+        self.assertEqual(store.cleanup_old(days=7), 1)
+        self.assertFalse(store.is_processed("old"))
+        self.assertTrue(store.is_processed("new"))
+        self.assertEqual(store.get_stats(), {"completed": 1, "total": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
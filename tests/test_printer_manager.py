@@ -0,0 +1,115 @@
+"""
+PrinterManager testleri
+Device node'a yazma: kısmi (short) write'larda kalan byte'ların tekrar yazılması,
+çıkarılan yazıcının event loop thread'inde listeden kaldırılması
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src import printer_manager
+from src.printer_detector import USBPrinter
+
+# Gerçek syscall - mock.patch printer_manager.os (= os) üzerinden değiştirir
+_write = os.write
+
+PARTS = [b"\x1b@", b"", b"\x1bt\x0d", b"Fis No 17", b"\n", b"x" * 40, b"\n", b"\x1dV\x00"]
+
+
+class ShortWriter:
+    """os.write yerine: her çağrıda en fazla `limit` byte yazar, çağrıları kaydeder"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.sizes = []
+
+    def write(self, fd, data):
+        self.sizes.append(len(data))
+        return _write(fd, bytes(data[:self.limit]))
+
+
+class WriteDeviceTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_list_joined_into_one_write(self):
+        expected = b"".join(PARTS)
+        writer = ShortWriter(len(expected))
+        with mock.patch.object(printer_manager.os, "write", writer.write):
+            written = printer_manager._write_device(self.path, PARTS)
+        self.assertEqual(written, len(expected))
+        self.assertEqual(self.read(), expected)
+        self.assertEqual(writer.sizes, [len(expected)])
+
+    def test_list_short_writes(self):
+        expected = b"".join(PARTS)
+        for limit in (1, 2, 3, 7, 64):
+            with self.subTest(limit=limit):
+                writer = ShortWriter(limit)
+                with mock.patch.object(printer_manager.os, "write", writer.write):
+                    written = printer_manager._write_device(self.path, PARTS)
+                self.assertEqual(written, len(expected))
+                self.assertEqual(self.read(), expected)
+                self.assertEqual(len(writer.sizes), -(-len(expected) // limit))
+
+    def test_stream_buffered(self):
+        chunks = [b"ab"] * 5
+        writer = ShortWriter(64)
+        with mock.patch.object(printer_manager, "WRITE_BUFFER_SIZE", 4), \
+                mock.patch.object(printer_manager.os, "write", writer.write):
+            written = printer_manager._write_device(self.path, iter(chunks))
+        self.assertEqual(written, 10)
+        self.assertEqual(self.read(), b"ab" * 5)
+        self.assertEqual(writer.sizes, [4, 4, 2])
+
+    def test_stream_short_writes(self):
+        writer = ShortWriter(4)
+        with mock.patch.object(printer_manager.os, "write", writer.write):
+            written = printer_manager._write_device(self.path, iter(PARTS))
+        self.assertEqual(written, len(b"".join(PARTS)))
+        self.assertEqual(self.read(), b"".join(PARTS))
+
+    def test_missing_device(self):
+        with self.assertRaises(FileNotFoundError):
+            printer_manager._write_device(self.path + ".missing", PARTS)
+
+
+class PrintAsyncTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.manager = printer_manager.PrinterManager()
+        self.path = os.path.join(tempfile.gettempdir(), "feedemy-test-lp-missing")
+        self.manager._on_printer_added(USBPrinter(self.path, "04b8", "0e03", None, None, None))
+
+    async def asyncTearDown(self):
+        await self.manager.stop()
+
+    async def test_missing_device_removed_on_loop_thread(self):
+        removed_in = []
+        original = self.manager._on_printer_removed
+
+        def on_removed(device_path):
+            removed_in.append(threading.current_thread())
+            original(device_path)
+
+        with mock.patch.object(self.manager, "_on_printer_removed", on_removed):
+            result = await self.manager.print_parts_async([b"\x1b@", b"test"])
+
+        self.assertFalse(result.success)
+        self.assertEqual(removed_in, [threading.current_thread()])
+        self.assertFalse(self.manager.has_printer())
+        self.assertIsNone(self.manager.get_default_printer())
+
+
+if __name__ == "__main__":
+    unittest.main()
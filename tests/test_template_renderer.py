@@ -0,0 +1,222 @@
+"""
+TemplateRenderer regresyon testleri
+Derlenmiş plan (compile_template) ile tüm render yolları aynı ESC/POS
+çıktısını üretmeli.
+"""
+
+import json
+import unittest
+
+from src.template_renderer import TemplateRenderer
+from templates.escpos_commands import (
+    INIT, LF, SELECT_CHARSET,
+    BOLD_ON, BOLD_OFF,
+    NORMAL, DOUBLE_WIDTH, ALIGN_LEFT, ALIGN_CENTER,
+    CUT_FULL, feed_lines
+)
+
+HEADER = INIT + SELECT_CHARSET
+
+ORDER = {
+    "orderNo": "A-17",
+    "customer": {"name": "Şükrü Öztürk", "address": {"city": "İzmir"}},
+    "total": 123.5,
+    "flag": True,
+    "off": False,
+    "zero": 0,
+    "empty": "",
+    "none": [],
+    "items": [
+        {
+            "quantity": 2,
+            "productName": "Çiğ Köfte",
+            "unitPrice": 45.5,
+            "selectedOption": {"optionName": "Büyük", "priceModifier": 5},
+            "removedIngredients": [{"ingredientName": "Soğan"}, "Marul"],
+            "addons": [
+                {"addonName": "Acı Sos", "quantity": 2, "unitPrice": 3, "relatedOptionName": "Büyük"},
+                {"name": "Limon", "price": 0},
+            ],
+            "subItems": [
+                {
+                    "displayTitle": "İçecek",
+                    "itemName": "Ayran",
+                    "quantity": 2,
+                    "additionalPrice": 1.5,
+                    "removedIngredientsText": "TUZSUZ",
+                    "addons": [{"addonName": "Buz", "quantity": 3, "lineTotal": 0.5}],
+                },
+            ],
+            "note": "Az pişmiş",
+        },
+        {"name": "Su", "price": 5, "selectedOption": "Soğuk", "selectedOptionPrice": -1},
+    ],
+}
+
+ITEM_FLAGS = (
+    "showQuantity", "showPrice", "showAddons", "showSubItems",
+    "showNotes", "showRemovedIngredients", "showSelectedOption",
+)
+
+
+def _template(elements, width=None):
+    template = {"elements": elements}
+    if width is not None:
+        template["width"] = width
+    return json.dumps(template)
+
+
+class RenderPathsTest(unittest.TestCase):
+    """render / render_compiled / render_parts / render_chunks aynı çıktı"""
+
+    def setUp(self):
+        self.renderer = TemplateRenderer(default_width=32)
+        self.data_json = json.dumps(ORDER)
+
+    def assert_paths_equal(self, template_json, data_json=None):
+        data_json = data_json or self.data_json
+        expected = self.renderer.render(template_json, data_json)
+        plan = self.renderer.compile_template(template_json)
+        self.assertEqual(self.renderer.render_compiled(plan, data_json), expected)
+        self.assertEqual(b"".join(self.renderer.render_parts(template_json, data_json)), expected)
+        self.assertEqual(b"".join(self.renderer.render_chunks(template_json, data_json)), expected)
+        self.assertEqual(self.renderer.compile(template_json)(json.loads(data_json)), expected)
+        # Cache'ten gelen plan da aynı çıktıyı vermeli
+        self.assertEqual(self.renderer.render(template_json, data_json), expected)
+        return expected
+
+    def test_mixed_template(self):
+        self.assert_paths_equal(_template([
+            {"t": "text", "v": "Sipariş {{orderNo}}", "a": "c", "s": "lg", "b": True},
+            {"t": "line", "c": "="},
+            {"t": "row", "l": "{{customer.name}}", "r": "{{total}}", "b": True},
+            {"t": "text", "v": "static"},
+            {"t": "feed", "n": 2},
+            {"t": "items"},
+            {"t": "cut"},
+        ], width=48))
+
+    def test_conditions(self):
+        elements = [
+            {"t": "text", "v": cond, "cond": cond}
+            for cond in ("flag", "off", "zero", "empty", "none", "items",
+                         "customer", "customer.name", "customer.nope", "missing")
+        ]
+        output = self.assert_paths_equal(_template(elements))
+        for shown in ("flag", "items", "customer", "customer.name"):
+            self.assertIn(shown.encode() + LF, output)
+        for hidden in (b"off", b"zero", b"empty", b"none", b"customer.nope", b"missing"):
+            self.assertNotIn(hidden + LF, output)
+
+    def test_item_flag_combinations(self):
+        for mask in range(1 << len(ITEM_FLAGS)):
+            element = {"t": "items"}
+            for bit, flag in enumerate(ITEM_FLAGS):
+                element[flag] = bool(mask & (1 << bit))
+            with self.subTest(element=element):
+                self.assert_paths_equal(_template([element]))
+
+    def test_item_prefixes_and_size(self):
+        self.assert_paths_equal(_template([{
+            "t": "items", "fontSize": "lg", "addonPrefix": " ++ ", "subItemPrefix": ">>",
+            "notePrefix": "NOT: ", "removedPrefix": "- YOK: ", "showRemovedIngredients": True,
+        }]))
+
+    def test_empty_and_missing_items(self):
+        template_json = _template([{"t": "items"}])
+        for data in ({"items": []}, {"items": None}, {}):
+            with self.subTest(data=data):
+                output = self.assert_paths_equal(template_json, json.dumps(data))
+                self.assertEqual(output, HEADER + NORMAL + NORMAL)
+
+    def test_invalid_json(self):
+        error = self.renderer.render("{bad", "{}")
+        self.assertTrue(error.startswith(INIT + ALIGN_CENTER + BOLD_ON + b"=== HATA ==="))
+        self.assertEqual(self.renderer.render(_template([]), "not json"), error)
+        self.assertEqual(self.renderer.render_parts("{bad", "{}"), [error])
+        self.assertEqual(list(self.renderer.render_chunks("{bad", "{}")), [error])
+
+
+class RenderOutputTest(unittest.TestCase):
+    """Tek tek element çıktıları (derleme sırasında sabitlenen bytes dahil)"""
+
+    def setUp(self):
+        self.renderer = TemplateRenderer(default_width=20)
+
+    def render(self, elements, data=None):
+        output = self.renderer.render(_template(elements), json.dumps(data or ORDER))
+        self.assertTrue(output.startswith(HEADER))
+        return output[len(HEADER):]
+
+    def test_text_placeholders(self):
+        output = self.render([{"t": "text", "v": "No {{orderNo}} {{customer.address.city}}{{missing}}!"}])
+        self.assertEqual(output, ALIGN_LEFT + NORMAL + b"No A-17 Izmir!" + LF + NORMAL + ALIGN_LEFT)
+
+    def test_bold_centered_text(self):
+        output = self.render([{"t": "text", "v": "Fiş", "a": "c", "s": "lg", "b": True}])
+        self.assertEqual(
+            output,
+            ALIGN_CENTER + DOUBLE_WIDTH + BOLD_ON + b"Fis" + LF + BOLD_OFF + NORMAL + ALIGN_LEFT
+        )
+
+    def test_row_padding(self):
+        output = self.render([
+            {"t": "row", "l": "Toplam", "r": "{{total}}"},
+            {"t": "row", "l": "L" * 30, "r": "R"},
+            {"t": "row", "l": "Big", "r": "{{orderNo}}", "s": "lg"},
+        ])
+        self.assertEqual(output, b"".join([
+            NORMAL, b"Toplam         123.5", LF, NORMAL,
+            NORMAL, b"L" * 30 + b" R", LF, NORMAL,
+            DOUBLE_WIDTH, b"Big   A-17", LF, NORMAL,
+        ]))
+
+    def test_constants(self):
+        output = self.render([{"t": "line"}, {"t": "feed", "n": 3}, {"t": "cut"}, {"t": "bogus"}])
+        self.assertEqual(output, b"-" * 20 + LF + feed_lines(3) + CUT_FULL)
+
+    def test_items_lines(self):
+        output = self.render([{"t": "items", "showRemovedIngredients": True}])
+        lines = output.split(LF)
+        self.assertEqual(lines[0], NORMAL + BOLD_ON + b"2x Cig Kofte   45.50")
+        self.assertIn(BOLD_OFF + b"  (Buyuk +5.00)", lines)
+        self.assertIn(BOLD_ON + b"  - CIKART: Sogan, Marul", lines)
+        self.assertIn(BOLD_OFF + b"  + 2x Aci Sos (Buyuk)  +6.00", lines)
+        self.assertIn(b"  + Limon", lines)
+        self.assertIn(b"  > Icecek: 2x Ayran  +1.50", lines)
+        self.assertIn(BOLD_ON + b"    TUZSUZ", lines)
+        self.assertIn(BOLD_OFF + b"      + 3x Buz  +0.50", lines)
+        self.assertIn(b"  * Az pismis", lines)
+        self.assertIn(BOLD_ON + b"1x Su           5.00", lines)
+        self.assertIn(BOLD_OFF + b"  (Soguk -1.00)", lines)
+        self.assertTrue(output.endswith(LF + NORMAL))
+
+
+class PlanCacheTest(unittest.TestCase):
+
+    def test_plan_reused_and_bounded(self):
+        from src import template_renderer
+
+        renderer = TemplateRenderer()
+        template_json = _template([{"t": "text", "v": "{{orderNo}}"}])
+        plan = renderer.compile_template(template_json)
+        self.assertIs(renderer.compile_template(template_json), plan)
+
+        for i in range(template_renderer.PLAN_CACHE_SIZE + 5):
+            renderer.compile_template(_template([{"t": "text", "v": str(i)}]))
+        self.assertEqual(len(renderer._plan_cache), template_renderer.PLAN_CACHE_SIZE)
+        self.assertNotIn(template_json, renderer._plan_cache)
+
+    def test_constant_elements_folded(self):
+        renderer = TemplateRenderer()
+        plan = renderer.compile_template(_template([
+            {"t": "text", "v": "a"}, {"t": "line"}, {"t": "feed"},
+            {"t": "text", "v": "{{orderNo}}"},
+            {"t": "cut"}, {"t": "text", "v": "b", "cond": "flag"},
+        ]))
+        # [INIT+a+line+feed] [placeholder] [cut] [conditional]
+        self.assertEqual(len(plan), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()